@@ -1,37 +1,1021 @@
 import logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logging.getLogger('httpx').setLevel(logging.WARNING)
 
+import io
+import gzip
+import asyncio
+import bisect
+import heapq
+import itertools
+import hashlib
 import re
 import os
-import tempfile
+import sys
+import json
+import atexit
+import sqlite3
+import contextlib
+import concurrent.futures
+import functools
 import threading
-from collections import deque
-from flask import Flask, jsonify, render_template, request
+import random
+import cProfile
+from collections import deque, OrderedDict, namedtuple
+try:
+    import fcntl
+except ImportError:  # Windows dev boxes: no cross-process lock, every process leads
+    fcntl = None
+try:
+    import resource
+except ImportError:
+    resource = None
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+from flask import Flask, Response, jsonify, render_template, request
+from werkzeug.security import safe_join
 from flask_cors import CORS
-from bs4 import BeautifulSoup
+from lxml import etree
 import requests
+from requests.adapters import HTTPAdapter
+import httpx
 from apscheduler.schedulers.background import BackgroundScheduler
-from datetime import datetime, timedelta
+from datetime import datetime
 import pytz
 import time
-from faster_whisper import WhisperModel
-from pydub import AudioSegment
+from faster_whisper import WhisperModel, BatchedInferencePipeline
+import av
+import numpy as np
 
 app = Flask(__name__)
 CORS(app)
 
-whisper_model = None
-fire_calls = []
 check_start_time = None
 check_finish_time = None
-processed_audio_urls = set()
-processing_lock = threading.Lock()
-call_queue = deque()
-queue_lock = threading.Lock()
+recheck_lock = threading.Lock()
 selected_states = set(["New Jersey", "New York", "Texas", "Illinois"])
 states_lock = threading.Lock()
 state_call_tracking = {}
 MAX_CALLS_PER_STATE = 20
+TRANSCRIBE_WORKERS = max(1, int(os.environ.get('TRANSCRIBE_WORKERS', max(1, (os.cpu_count() or 2) // 2))))
+WHISPER_MODEL = os.environ.get('WHISPER_MODEL', 'small')  # size name or path to a converted model directory
+WHISPER_DEVICE = os.environ.get('WHISPER_DEVICE', 'cpu')
+WHISPER_COMPUTE_TYPE = os.environ.get('WHISPER_COMPUTE_TYPE', 'int8')
+WHISPER_CPU_THREADS = int(os.environ.get('WHISPER_CPU_THREADS', max(1, (os.cpu_count() or 1) // TRANSCRIBE_WORKERS)))
+WHISPER_NUM_WORKERS = int(os.environ.get('WHISPER_NUM_WORKERS', TRANSCRIBE_WORKERS))
+WHISPER_DOWNLOAD_ROOT = os.environ.get('WHISPER_DOWNLOAD_ROOT')
+WHISPER_LOCAL_FILES_ONLY = os.environ.get('WHISPER_LOCAL_FILES_ONLY') == '1'  # offline boots from a pre-fetched cache
+CALL_QUEUE_MAX = int(os.environ.get('CALL_QUEUE_MAX', 200))
+METRICS_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300]
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))  # fraction of queue jobs run under cProfile
+PROFILE_DIR = os.environ.get('PROFILE_DIR', '/tmp/watch-duty-profiles')
+QUEUE_STALE_SECONDS = int(os.environ.get('QUEUE_STALE_SECONDS', 900))
+# Queue share per state relative to the default of 1, e.g. "California=2,Texas=0.5"
+STATE_WEIGHTS = {state.strip(): float(weight) for state, weight in
+                 (item.rsplit('=', 1) for item in os.environ.get('STATE_WEIGHTS', '').split(',') if '=' in item)}
+# Seconds of recency credited by agency type when ordering calls within a state
+AGENCY_PRIORITY_BONUS = {'fire': 300, 'other': 0, 'ems': -300}
+WHISPER_SAMPLE_RATE = 16000
+TRANSCRIBE_BATCH_SIZE = max(1, int(os.environ.get('TRANSCRIBE_BATCH_SIZE', 1)))
+TRANSCRIBE_BATCH_MAX_WAIT = float(os.environ.get('TRANSCRIBE_BATCH_MAX_WAIT', 2.0))
+BATCH_CLIP_MAX_SECONDS = 25  # each clip must fit in one 30s Whisper window
+# Long calls: after the first 25s, further overlapping windows are transcribed at low priority
+# up to this many seconds (0 keeps the hard 25s cap)
+LONG_AUDIO_MAX_SECONDS = int(os.environ.get('LONG_AUDIO_MAX_SECONDS', 120))
+LONG_AUDIO_OVERLAP_SECONDS = 3
+CHANGE_LOG_SIZE = 1000
+STREAMING_DETECTION = os.environ.get('STREAMING_DETECTION', '1') != '0'
+WHISPER_VAD_FILTER = os.environ.get('WHISPER_VAD_FILTER', '1') != '0'
+REFINE_BEAM_SIZE = int(os.environ.get('REFINE_BEAM_SIZE', 5))  # 0 disables the beam-search pass on hits
+detection_stats_lock = threading.Lock()
+detection_stats = {'calls': 0, 'early_exits': 0, 'refinements': 0, 'cpu_seconds': 0.0, 'wall_seconds': 0.0}
+AUDIO_PREFETCH_COUNT = int(os.environ.get('AUDIO_PREFETCH_COUNT', 4))
+AUDIO_PREFETCH_MAX_BYTES = int(os.environ.get('AUDIO_PREFETCH_MAX_BYTES', 32 * 1024 * 1024))
+AUDIO_PREFETCH_TTL = 300  # drop buffered audio nobody claimed (e.g. calls removed by the state filter)
+TRANSCRIPT_CACHE_SIZE = int(os.environ.get('TRANSCRIPT_CACHE_SIZE', 2000))
+SHARED_STATE_DB = os.environ.get('SHARED_STATE_DB')  # set when several gunicorn workers share one call store
+LEADER_LOCK_PATH = os.environ.get('LEADER_LOCK_PATH') or (SHARED_STATE_DB + '.lock' if SHARED_STATE_DB else None)
+LEADER_RETRY_SECONDS = 15
+SHARED_STATUS_INTERVAL = 5
+LONG_POLL_MAX_SECONDS = 25
+TRANSCRIPT_PREVIEW_CHARS = 160  # the call list carries this much; the rest comes from /api/fire-calls/<id>
+COMPRESS_MIN_BYTES = 512
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/javascript', 'text/javascript', 'text/css',
+                          'text/html', 'text/plain', 'application/manifest+json'}
+DEDUP_TTL_SECONDS = int(os.environ.get('DEDUP_TTL_SECONDS', 3 * 3600))
+DEDUP_MAX_ENTRIES = int(os.environ.get('DEDUP_MAX_ENTRIES', 50000))
+DEDUP_STATE_PATH = os.environ.get('DEDUP_STATE_PATH')  # optional, survives restarts when set
+CALL_LOG_URL = os.environ.get('CALL_LOG_URL', "https://call-log-api.edispatches.com/calls/")
+call_log_state = {'etag': None, 'last_modified': None, 'high_water_url': None}
+pipeline_stats_lock = threading.Lock()
+pipeline_stats = {'processed': 0, 'busy_workers': 0}
+recent_latencies = deque(maxlen=100)  # (queue_wait, processing) seconds per call
+
+
+class Metrics:
+    # Minimal Prometheus-style registry: per-stage latency histograms and labelled counters,
+    # rendered in the text exposition format by /metrics. Values are per process.
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self._histograms = {}  # stage -> [bucket counts..., +Inf count, sum]
+        self._counters = {}  # (name, label pairs) -> value
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = [0] * (len(self.buckets) + 2)
+            histogram[bisect.bisect_left(self.buckets, seconds)] += 1
+            histogram[-1] += seconds
+
+    @contextlib.contextmanager
+    def time(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def timed(self, stage):
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.time(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def render(self, gauges):
+        with self._lock:
+            histograms = {stage: list(values) for stage, values in self._histograms.items()}
+            counters = dict(self._counters)
+        lines = [
+            '# HELP watchduty_stage_seconds Time spent per pipeline stage',
+            '# TYPE watchduty_stage_seconds histogram'
+        ]
+        for stage, values in sorted(histograms.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + [float('inf')], values):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'watchduty_stage_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'watchduty_stage_seconds_sum{{stage="{stage}"}} {values[-1]:.6f}')
+            lines.append(f'watchduty_stage_seconds_count{{stage="{stage}"}} {cumulative}')
+        for name in sorted({name for name, _ in counters}):
+            lines.append(f'# TYPE {name} counter')
+            for (counter_name, labels), value in sorted(counters.items()):
+                if counter_name == name:
+                    label_text = ','.join(f'{k}="{v}"' for k, v in labels)
+                    lines.append(f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}')
+        for name, value in gauges.items():
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics(METRICS_BUCKETS)
+
+
+def current_rss_bytes():
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 if resource else 0
+
+
+profile_lock = threading.Lock()
+
+def profiled(func):
+    # Run a sampled fraction of jobs under cProfile and dump the stats to PROFILE_DIR.
+    # One profile at a time; jobs that lose the race run unprofiled.
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if PROFILE_SAMPLE_RATE <= 0 or random.random() >= PROFILE_SAMPLE_RATE or not profile_lock.acquire(blocking=False):
+            return func(*args, **kwargs)
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(func, *args, **kwargs)
+        finally:
+            profile_lock.release()
+            try:
+                os.makedirs(PROFILE_DIR, exist_ok=True)
+                path = os.path.join(PROFILE_DIR, f"{func.__name__}-{int(time.time() * 1000)}-{os.getpid()}.prof")
+                profiler.dump_stats(path)
+                logging.info(f"Wrote profile {path}")
+            except OSError as e:
+                logging.error(f"Could not write profile: {str(e)}")
+    return wrapper
+
+
+class CallQueue:
+    # Bounded priority queue shared by the scraper and the transcription workers.
+    # Each state keeps a heap with the newest calls first (fire agencies get a head start), and
+    # states take turns by weighted fair share so one busy state can't starve the others.
+    # Calls that wait longer than QUEUE_STALE_SECONDS are dropped. Deferred work (later windows
+    # of long calls) waits in a separate FIFO that is only served when no new call is queued.
+    def __init__(self, maxsize, state_weights=None, stale_seconds=QUEUE_STALE_SECONDS):
+        self.maxsize = maxsize
+        self.state_weights = state_weights or {}
+        self.stale_seconds = stale_seconds
+        self._heaps = {}  # state -> [(priority, seq, call_info)]
+        self._vtime = {}  # state -> virtual time; the non-empty state with the lowest value is served next
+        self._clock = 0.0
+        self._seq = itertools.count()
+        self._pending_urls = set()  # queued or currently being transcribed
+        self._size = 0
+        self._deferred = deque()
+        self._expired = 0
+        self._last_expire = time.time()
+        self._cond = threading.Condition()
+
+    def __len__(self):
+        with self._cond:
+            return self._size
+
+    def is_full(self):
+        with self._cond:
+            return self._size >= self.maxsize
+
+    @staticmethod
+    def priority(call_info, call_time=None):
+        # Lower sorts first: newer calls, then fire agencies ahead of ambiguous ones
+        if call_time is None:
+            call_time = call_info['enqueued_at']
+        return -(call_time + AGENCY_PRIORITY_BONUS.get(classify_agency(call_info['agency']), 0))
+
+    def put(self, call_info, call_time=None):
+        with self._cond:
+            audio_url = call_info['audio_url']
+            if audio_url in self._pending_urls or self._size >= self.maxsize:
+                return False
+            call_info['enqueued_at'] = time.time()
+            state = call_info['state']
+            if state not in self._heaps:
+                self._heaps[state] = []
+                self._vtime[state] = self._clock
+            heapq.heappush(self._heaps[state], (self.priority(call_info, call_time), next(self._seq), call_info))
+            self._pending_urls.add(audio_url)
+            self._size += 1
+            self._cond.notify()
+            return True
+
+    def put_deferred(self, call_info):
+        with self._cond:
+            if len(self._deferred) >= self.maxsize:
+                return False
+            call_info['enqueued_at'] = time.time()
+            self._deferred.append(call_info)
+            self._cond.notify()
+            return True
+
+    def _has_work_locked(self):
+        return self._size > 0 or bool(self._deferred)
+
+    def _pop_locked(self):
+        if self._size == 0:
+            return self._deferred.popleft() if self._deferred else None
+        state = min(self._vtime, key=lambda s: (self._vtime[s], self._heaps[s][0][0]))
+        heap = self._heaps[state]
+        call_info = heapq.heappop(heap)[2]
+        self._clock = max(self._clock, self._vtime[state])
+        self._vtime[state] += 1.0 / self.state_weights.get(state, 1.0)
+        if not heap:
+            del self._heaps[state]
+            del self._vtime[state]
+        self._size -= 1
+        return call_info
+
+    def _drop_state_locked(self, state):
+        heap = self._heaps.pop(state)
+        del self._vtime[state]
+        for _, _, call_info in heap:
+            self._pending_urls.discard(call_info['audio_url'])
+        self._size -= len(heap)
+        return len(heap)
+
+    def _expire_locked(self):
+        now = time.time()
+        self._last_expire = now
+        expired = 0
+        for state in list(self._heaps):
+            heap = self._heaps[state]
+            fresh = [entry for entry in heap if now - entry[2]['enqueued_at'] <= self.stale_seconds]
+            if len(fresh) == len(heap):
+                continue
+            for _, _, call_info in heap:
+                if now - call_info['enqueued_at'] > self.stale_seconds:
+                    self._pending_urls.discard(call_info['audio_url'])
+            expired += len(heap) - len(fresh)
+            self._size -= len(heap) - len(fresh)
+            if fresh:
+                heapq.heapify(fresh)
+                self._heaps[state] = fresh
+            else:
+                del self._heaps[state]
+                del self._vtime[state]
+        fresh_deferred = [c for c in self._deferred if now - c['enqueued_at'] <= self.stale_seconds]
+        expired += len(self._deferred) - len(fresh_deferred)
+        self._deferred = deque(fresh_deferred)
+        if expired:
+            self._expired += expired
+            logging.warning(f"Dropped {expired} calls that waited more than {self.stale_seconds}s in the queue")
+        return expired
+
+    def expire(self):
+        with self._cond:
+            return self._expire_locked()
+
+    def get(self, timeout=None):
+        batch = self.get_batch(1, timeout=timeout)
+        return batch[0] if batch else None
+
+    def get_batch(self, max_items, timeout=None, max_wait=0.0):
+        # Block up to timeout for the first call, then keep collecting for up to max_wait seconds.
+        # Deferred work is always handed out on its own.
+        with self._cond:
+            if not self._cond.wait_for(self._has_work_locked, timeout=timeout):
+                return []
+            if time.time() - self._last_expire > 30:
+                self._expire_locked()
+            deferred = self._size == 0
+            first = self._pop_locked()
+            if first is None:
+                return []
+            if deferred:
+                return [first]
+            batch = [first]
+            deadline = time.monotonic() + max_wait
+            while len(batch) < max_items:
+                if self._size == 0:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._cond.wait_for(lambda: self._size > 0, timeout=remaining):
+                        break
+                batch.append(self._pop_locked())
+            return batch
+
+    def peek(self, count):
+        # The next `count` calls in the order they would be served, without removing them
+        with self._cond:
+            heads = {state: heapq.nsmallest(count, heap) for state, heap in self._heaps.items()}
+            vtime = dict(self._vtime)
+            upcoming = []
+            while vtime and len(upcoming) < count:
+                state = min(vtime, key=lambda s: (vtime[s], heads[s][0][0]))
+                upcoming.append(heads[state].pop(0)[2])
+                vtime[state] += 1.0 / self.state_weights.get(state, 1.0)
+                if not heads[state]:
+                    del vtime[state]
+            upcoming.extend(itertools.islice(self._deferred, count - len(upcoming)))
+            return upcoming
+
+    def in_flight_urls(self):
+        # Calls taken by a worker and not yet marked done
+        with self._cond:
+            queued = {entry[2]['audio_url'] for heap in self._heaps.values() for entry in heap}
+            return self._pending_urls - queued
+
+    def task_done(self, call_info):
+        with self._cond:
+            self._pending_urls.discard(call_info['audio_url'])
+
+    def clear(self):
+        with self._cond:
+            for state in list(self._heaps):
+                self._drop_state_locked(state)
+            self._deferred.clear()
+
+    def retain_states(self, states):
+        # Only the heaps of deselected states are touched
+        with self._cond:
+            removed_count = sum(self._drop_state_locked(state) for state in [s for s in self._heaps if s not in states])
+            if any(c['state'] not in states for c in self._deferred):
+                self._deferred = deque(c for c in self._deferred if c['state'] in states)
+            return removed_count
+
+    def stats(self):
+        with self._cond:
+            oldest = min((entry[2]['enqueued_at'] for heap in self._heaps.values() for entry in heap), default=None)
+            return {
+                'depth': self._size,
+                'in_flight': len(self._pending_urls) - self._size,
+                'oldest_wait_seconds': round(time.time() - oldest, 1) if oldest else 0.0,
+                'deferred': len(self._deferred),
+                'expired': self._expired,
+                'per_state': {state: len(heap) for state, heap in self._heaps.items()}
+            }
+
+
+call_queue = CallQueue(CALL_QUEUE_MAX, state_weights=STATE_WEIGHTS)
+
+
+class AudioPrefetcher:
+    # Async producer stage: an asyncio loop on its own thread downloads audio for the calls at
+    # the head of the queue over a keep-alive httpx pool while Whisper is busy, so workers
+    # usually find the bytes already in memory. Buffered bytes are capped; past the cap,
+    # prefetching pauses and workers fetch on demand through the same pool. Buffers for calls
+    # that are neither upcoming nor being worked on any more are released on the next prefetch.
+    def __init__(self, max_concurrent, max_buffered_bytes):
+        self.max_concurrent = max_concurrent
+        self.max_buffered_bytes = max_buffered_bytes
+        self._loop = None
+        self._client = None
+        self._semaphore = None
+        self._demand_semaphore = None
+        self._pending = {}  # audio_url -> [concurrent.futures.Future, started_at, buffered bytes]
+        self._buffered_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def running(self):
+        return self._loop is not None
+
+    def start(self):
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, name="audio-prefetch", daemon=True).start()
+        asyncio.run_coroutine_threadsafe(self._setup(), loop).result()
+        self._loop = loop
+
+    async def _setup(self):
+        limits = httpx.Limits(max_connections=self.max_concurrent + TRANSCRIBE_WORKERS,
+                              max_keepalive_connections=self.max_concurrent + TRANSCRIBE_WORKERS)
+        self._client = httpx.AsyncClient(limits=limits, timeout=30, follow_redirects=True)
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        # Workers' cache misses get their own permits so they never queue behind speculative downloads
+        self._demand_semaphore = asyncio.Semaphore(TRANSCRIBE_WORKERS)
+
+    async def _fetch(self, audio_url, semaphore):
+        async with semaphore:
+            response = await self._client.get(audio_url)
+            response.raise_for_status()
+            return response.content
+
+    def _on_done(self, audio_url, future):
+        if not future.cancelled() and future.exception() is None:
+            with self._lock:
+                entry = self._pending.get(audio_url)
+                if entry is not None and entry[0] is future:
+                    entry[2] = len(future.result())
+                    self._buffered_bytes += entry[2]
+
+    def prefetch(self, audio_urls, in_flight=()):
+        # audio_urls: the calls about to be served; in_flight: calls a worker has already taken
+        if not self.running:
+            return
+        now = time.time()
+        keep = set(audio_urls) | set(in_flight)
+        with self._lock:
+            for audio_url, (future, started_at, _) in list(self._pending.items()):
+                if audio_url not in keep or now - started_at > AUDIO_PREFETCH_TTL:
+                    self._release_locked(audio_url)
+            for audio_url in audio_urls:
+                if audio_url in self._pending:
+                    continue
+                if len(self._pending) >= self.max_concurrent * 2 or self._buffered_bytes >= self.max_buffered_bytes:
+                    break
+                future = asyncio.run_coroutine_threadsafe(self._fetch(audio_url, self._semaphore), self._loop)
+                self._pending[audio_url] = [future, now, 0]
+                future.add_done_callback(functools.partial(self._on_done, audio_url))
+
+    def _release_locked(self, audio_url):
+        future, _, buffered = self._pending.pop(audio_url)
+        self._buffered_bytes -= buffered
+        if not future.done():
+            future.cancel()
+        return future
+
+    def get(self, audio_url, timeout=60):
+        with self._lock:
+            entry = self._pending.get(audio_url)
+            if entry is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if entry is None:
+            return asyncio.run_coroutine_threadsafe(self._fetch(audio_url, self._demand_semaphore),
+                                                    self._loop).result(timeout)
+        try:
+            return entry[0].result(timeout)
+        except concurrent.futures.CancelledError:
+            # Released by a concurrent prefetch() while we were waiting
+            return asyncio.run_coroutine_threadsafe(self._fetch(audio_url, self._demand_semaphore),
+                                                    self._loop).result(timeout)
+        finally:
+            with self._lock:
+                if self._pending.get(audio_url) is entry:
+                    self._release_locked(audio_url)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'running': self.running,
+                'in_flight_or_buffered': len(self._pending),
+                'buffered_bytes': self._buffered_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+audio_prefetcher = AudioPrefetcher(AUDIO_PREFETCH_COUNT, AUDIO_PREFETCH_MAX_BYTES)
+
+
+class DedupStore:
+    # Audio URLs that were already transcribed or skipped. Entries are kept in insertion
+    # order, so TTL and size eviction just pop from the old end; lookups stay O(1).
+    def __init__(self, ttl_seconds, max_entries, path=None):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.path = path
+        self._entries = OrderedDict()  # audio_url -> epoch seconds when added
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.evicted = 0
+
+    def __contains__(self, audio_url):
+        with self._lock:
+            return audio_url in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def add(self, audio_url):
+        now = time.time()
+        with self._lock:
+            self._entries[audio_url] = now
+            self._entries.move_to_end(audio_url)
+            self._dirty = True
+            self._evict_locked(now)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+
+    def _evict_locked(self, now):
+        cutoff = now - self.ttl_seconds
+        while self._entries:
+            oldest_url, added_at = next(iter(self._entries.items()))
+            if added_at >= cutoff and len(self._entries) <= self.max_entries:
+                break
+            self._entries.popitem(last=False)
+            self.evicted += 1
+
+    def expire(self):
+        with self._lock:
+            self._evict_locked(time.time())
+
+    def stats(self):
+        with self._lock:
+            approx_bytes = sys.getsizeof(self._entries) + sum(sys.getsizeof(url) + 32 for url in self._entries)
+            oldest = next(iter(self._entries.values()), None)
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'evicted': self.evicted,
+                'approx_bytes': approx_bytes,
+                'oldest_age_seconds': round(time.time() - oldest, 1) if oldest else 0.0
+            }
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = list(self._entries.items())
+            self._dirty = False
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.error(f"Failed to save dedup state to {self.path}: {e}")
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.error(f"Failed to load dedup state from {self.path}: {e}")
+            return
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            for audio_url, added_at in entries:
+                if added_at >= cutoff:
+                    self._entries[audio_url] = added_at
+            self._evict_locked(time.time())
+        logging.info(f"Loaded {len(self)} processed audio URLs from {self.path}")
+
+
+processed_audio_urls = DedupStore(DEDUP_TTL_SECONDS, DEDUP_MAX_ENTRIES, DEDUP_STATE_PATH)
+
+
+class TranscriptCache:
+    # What we last transcribed for each audio URL: content hash, byte length, seconds decoded,
+    # transcript and how long Whisper took. Identical bytes (by sha256) reuse the transcript,
+    # and the recheck uses byte_length/audio_seconds to decide whether anything new was appended.
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # audio_url -> entry, least recently used first
+        self._by_hash = {}  # sha256 -> audio_url
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.tail_updates = 0
+        self.seconds_saved = 0.0
+
+    def get(self, audio_url):
+        with self._lock:
+            entry = self._entries.get(audio_url)
+            if entry is None:
+                return None
+            self._entries.move_to_end(audio_url)
+            return dict(entry)
+
+    def get_by_hash(self, digest, max_seconds):
+        with self._lock:
+            audio_url = self._by_hash.get(digest)
+            entry = self._entries.get(audio_url) if audio_url else None
+            if entry is None or entry['max_seconds'] != max_seconds:
+                return None
+            return dict(entry)
+
+    def put(self, audio_url, digest, byte_length, audio_seconds, max_seconds, transcript, transcribe_seconds):
+        with self._lock:
+            old = self._entries.pop(audio_url, None)
+            if old and old['sha256']:
+                self._by_hash.pop(old['sha256'], None)
+            self._entries[audio_url] = {
+                'sha256': digest,
+                'byte_length': byte_length,
+                'audio_seconds': audio_seconds,
+                'max_seconds': max_seconds,
+                'transcript': transcript,
+                'transcribe_seconds': transcribe_seconds
+            }
+            if digest:
+                self._by_hash[digest] = audio_url
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                if evicted['sha256']:
+                    self._by_hash.pop(evicted['sha256'], None)
+
+    def record_hit(self, seconds_saved):
+        with self._lock:
+            self.hits += 1
+            self.seconds_saved += seconds_saved
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def record_tail_update(self, seconds_saved):
+        with self._lock:
+            self.tail_updates += 1
+            self.seconds_saved += seconds_saved
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.tail_updates
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'tail_updates': self.tail_updates,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'seconds_saved': round(self.seconds_saved, 1)
+            }
+
+
+transcript_cache = TranscriptCache(TRANSCRIPT_CACHE_SIZE)
+
+
+class CallStore:
+    # Detected fire calls, shared by the Flask request threads, the scheduler and the workers.
+    # Calls are indexed by id and kept in detection order (oldest first), with detection
+    # time held as epoch seconds so cleanup pops from the old end. Readers get copies.
+    def __init__(self):
+        self._calls = OrderedDict()  # id -> call dict
+        self._detected_at = {}  # id -> epoch seconds
+        self._by_state = {}  # state -> set of ids
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        self._changes = deque(maxlen=CHANGE_LOG_SIZE)  # (revision, call_id) per mutation
+        self.revision = 0
+        self.epoch = os.urandom(4).hex()  # revisions restart with the process; clients from before must reset
+
+    def _record_change_locked(self, call_id):
+        self.revision += 1
+        self._changes.append((self.revision, call_id))
+        self._changed.notify_all()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._calls)
+
+    def __contains__(self, call_id):
+        with self._lock:
+            return call_id in self._calls
+
+    def get(self, call_id):
+        with self._lock:
+            call = self._calls.get(call_id)
+            return dict(call) if call else None
+
+    def add(self, call_data, detected_at=None):
+        with self._lock:
+            call_id = call_data['id']
+            if call_id in self._calls:
+                return False
+            self._calls[call_id] = dict(call_data)
+            self._detected_at[call_id] = detected_at or time.time()
+            self._by_state.setdefault(call_data['state'], set()).add(call_id)
+            self._record_change_locked(call_id)
+            return True
+
+    def update(self, call_id, **fields):
+        with self._lock:
+            call = self._calls.get(call_id)
+            if call is None:
+                return False
+            call.update(fields)
+            self._record_change_locked(call_id)
+            return True
+
+    def acknowledge(self, call_id):
+        return self.update(call_id, acknowledged=True)
+
+    def _remove_locked(self, call_id):
+        call = self._calls.pop(call_id)
+        del self._detected_at[call_id]
+        state_ids = self._by_state.get(call['state'])
+        if state_ids is not None:
+            state_ids.discard(call_id)
+            if not state_ids:
+                del self._by_state[call['state']]
+        self._record_change_locked(call_id)
+        return call
+
+    def delete(self, call_id):
+        with self._lock:
+            if call_id not in self._calls:
+                return False
+            self._remove_locked(call_id)
+            return True
+
+    def list(self):
+        # Newest detection first, as the API has always returned them
+        with self._lock:
+            return [dict(call) for call in reversed(self._calls.values())]
+
+    def detected_since(self, since):
+        with self._lock:
+            recent = []
+            for call_id in reversed(self._calls):
+                if self._detected_at[call_id] < since:
+                    break
+                recent.append(dict(self._calls[call_id]))
+            return recent
+
+    def cleanup(self, max_age_seconds, keep_latest):
+        cutoff = time.time() - max_age_seconds
+        removed_count = 0
+        with self._lock:
+            while len(self._calls) > keep_latest:
+                oldest_id = next(iter(self._calls))
+                if self._detected_at[oldest_id] >= cutoff:
+                    break
+                self._remove_locked(oldest_id)
+                removed_count += 1
+        return removed_count
+
+    def changes_since(self, since=None, states=None):
+        # Snapshot for the API: everything when since is unknown or older than the change log,
+        # otherwise only the calls touched after revision `since` plus the ids that were removed.
+        with self._lock:
+            oldest_logged = self._changes[0][0] if self._changes else self.revision + 1
+            if since is None or since > self.revision or since < oldest_logged - 1:
+                if states:
+                    ids = [i for state in states for i in self._by_state.get(state, ())]
+                    ids.sort(key=self._detected_at.__getitem__, reverse=True)
+                else:
+                    ids = reversed(self._calls)
+                return {'revision': self.revision, 'full': True, 'calls': [dict(self._calls[i]) for i in ids], 'removed': []}
+            changed_ids = []
+            seen = set()
+            for revision, call_id in reversed(self._changes):
+                if revision <= since:
+                    break
+                if call_id not in seen:
+                    seen.add(call_id)
+                    changed_ids.append(call_id)
+            calls = [dict(self._calls[i]) for i in changed_ids
+                     if i in self._calls and (not states or self._calls[i]['state'] in states)]
+            removed = [i for i in changed_ids if i not in self._calls]
+            calls.sort(key=lambda c: self._detected_at[c['id']], reverse=True)
+            return {'revision': self.revision, 'full': False, 'calls': calls, 'removed': removed}
+
+    def wait_for_change(self, since, timeout):
+        with self._changed:
+            return self._changed.wait_for(lambda: self.revision != since, timeout=timeout)
+
+    def state_counts(self):
+        with self._lock:
+            return {state: len(ids) for state, ids in self._by_state.items()}
+
+
+class SqliteCallStore:
+    # CallStore backed by SQLite in WAL mode, so every gunicorn worker serves the same calls.
+    # Same interface as CallStore: each row carries the revision of its last change, removals
+    # are logged in removed_calls, and the meta table holds the revision counter and the
+    # status/settings that the leader and followers exchange.
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS calls (
+            id TEXT PRIMARY KEY,
+            state TEXT NOT NULL,
+            detected_at REAL NOT NULL,
+            revision INTEGER NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS calls_detected_at ON calls (detected_at);
+        CREATE INDEX IF NOT EXISTS calls_state ON calls (state);
+        CREATE INDEX IF NOT EXISTS calls_revision ON calls (revision);
+        CREATE TABLE IF NOT EXISTS removed_calls (id TEXT PRIMARY KEY, revision INTEGER NOT NULL);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        INSERT OR IGNORE INTO meta (key, value) VALUES ('revision', '0'), ('log_floor', '0');
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._conn().executescript(self.SCHEMA)
+        # Revisions persist with the database file, so the epoch only changes with a new file
+        self._conn().execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('epoch', ?)", (os.urandom(4).hex(),))
+        self.epoch = self.get_meta('epoch')
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    @contextlib.contextmanager
+    def _transaction(self, write=True):
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE' if write else 'BEGIN')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    def _meta_int(self, conn, key):
+        return int(conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()[0])
+
+    def _bump_revision(self, conn):
+        conn.execute("UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'revision'")
+        return self._meta_int(conn, 'revision')
+
+    @property
+    def revision(self):
+        return int(self.get_meta('revision'))
+
+    def get_meta(self, key):
+        row = self._conn().execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        self._conn().execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    def __len__(self):
+        return self._conn().execute('SELECT COUNT(*) FROM calls').fetchone()[0]
+
+    def __contains__(self, call_id):
+        return self._conn().execute('SELECT 1 FROM calls WHERE id = ?', (call_id,)).fetchone() is not None
+
+    def get(self, call_id):
+        row = self._conn().execute('SELECT data FROM calls WHERE id = ?', (call_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def add(self, call_data, detected_at=None):
+        with self._transaction() as conn:
+            if conn.execute('SELECT 1 FROM calls WHERE id = ?', (call_data['id'],)).fetchone():
+                return False
+            revision = self._bump_revision(conn)
+            conn.execute('INSERT INTO calls (id, state, detected_at, revision, data) VALUES (?, ?, ?, ?, ?)',
+                         (call_data['id'], call_data['state'], detected_at or time.time(), revision, json.dumps(call_data)))
+            conn.execute('DELETE FROM removed_calls WHERE id = ?', (call_data['id'],))
+            return True
+
+    def update(self, call_id, **fields):
+        with self._transaction() as conn:
+            row = conn.execute('SELECT data FROM calls WHERE id = ?', (call_id,)).fetchone()
+            if row is None:
+                return False
+            call = json.loads(row[0])
+            call.update(fields)
+            revision = self._bump_revision(conn)
+            conn.execute('UPDATE calls SET data = ?, revision = ? WHERE id = ?', (json.dumps(call), revision, call_id))
+            return True
+
+    def acknowledge(self, call_id):
+        return self.update(call_id, acknowledged=True)
+
+    def _remove(self, conn, call_ids):
+        for call_id in call_ids:
+            revision = self._bump_revision(conn)
+            conn.execute('DELETE FROM calls WHERE id = ?', (call_id,))
+            conn.execute('INSERT OR REPLACE INTO removed_calls (id, revision) VALUES (?, ?)', (call_id, revision))
+        row = conn.execute('SELECT revision FROM removed_calls ORDER BY revision DESC LIMIT 1 OFFSET ?',
+                           (CHANGE_LOG_SIZE,)).fetchone()
+        if row:
+            # Deltas from before the pruned removals can no longer be served; clients get a full list
+            conn.execute('DELETE FROM removed_calls WHERE revision <= ?', (row[0],))
+            conn.execute("UPDATE meta SET value = ? WHERE key = 'log_floor'", (str(row[0]),))
+
+    def delete(self, call_id):
+        with self._transaction() as conn:
+            if not conn.execute('SELECT 1 FROM calls WHERE id = ?', (call_id,)).fetchone():
+                return False
+            self._remove(conn, [call_id])
+            return True
+
+    def list(self):
+        rows = self._conn().execute('SELECT data FROM calls ORDER BY detected_at DESC').fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def detected_since(self, since):
+        rows = self._conn().execute('SELECT data FROM calls WHERE detected_at >= ? ORDER BY detected_at DESC',
+                                    (since,)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def cleanup(self, max_age_seconds, keep_latest):
+        cutoff = time.time() - max_age_seconds
+        with self._transaction() as conn:
+            total = conn.execute('SELECT COUNT(*) FROM calls').fetchone()[0]
+            removable = max(0, total - keep_latest)
+            old_ids = [row[0] for row in conn.execute(
+                'SELECT id FROM calls WHERE detected_at < ? ORDER BY detected_at ASC LIMIT ?', (cutoff, removable))]
+            self._remove(conn, old_ids)
+            return len(old_ids)
+
+    def changes_since(self, since=None, states=None):
+        state_clause = ''
+        state_args = ()
+        if states:
+            state_clause = ' AND state IN (%s)' % ','.join('?' * len(states))
+            state_args = tuple(states)
+        with self._transaction(write=False) as conn:
+            revision = self._meta_int(conn, 'revision')
+            log_floor = self._meta_int(conn, 'log_floor')
+            if since is None or since > revision or since < log_floor:
+                rows = conn.execute('SELECT data FROM calls WHERE 1 = 1' + state_clause + ' ORDER BY detected_at DESC',
+                                    state_args).fetchall()
+                return {'revision': revision, 'full': True, 'calls': [json.loads(r[0]) for r in rows], 'removed': []}
+            rows = conn.execute('SELECT data FROM calls WHERE revision > ?' + state_clause + ' ORDER BY detected_at DESC',
+                                (since,) + state_args).fetchall()
+            removed = [r[0] for r in conn.execute('SELECT id FROM removed_calls WHERE revision > ?', (since,))]
+            return {'revision': revision, 'full': False, 'calls': [json.loads(r[0]) for r in rows], 'removed': removed}
+
+    def wait_for_change(self, since, timeout):
+        # Writers may live in another process, so poll the revision instead of waiting on a condition
+        deadline = time.monotonic() + timeout
+        while self.revision == since:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(0.25, remaining))
+        return True
+
+    def state_counts(self):
+        return dict(self._conn().execute('SELECT state, COUNT(*) FROM calls GROUP BY state').fetchall())
+
+
+fire_calls = SqliteCallStore(SHARED_STATE_DB) if SHARED_STATE_DB else CallStore()
+
+# One keep-alive pool for the call log and audio downloads instead of a new connection per request
+http_session = requests.Session()
+http_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=TRANSCRIBE_WORKERS + 4))
+http_session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=TRANSCRIBE_WORKERS + 4))
 
 FIRE_KEYWORDS = [
     r'grass[\s_-]?fire', r'grass[\s_-]?on[\s_-]?fire',
@@ -78,181 +1062,615 @@ def extract_state_from_location(location):
         return US_STATES.get(state_abbr, state_abbr)
     return "Unknown"
 
-def is_fire_call_in_transcript(transcript):
+FIRE_MATCH_PATTERNS = FIRE_KEYWORDS + [r'out[\s_-]?of[\s_-]?control[\s_-]?burn']
+# All keywords compiled into one alternation so a transcript is scanned once. Named groups
+# would disable re's literal-prefix scan, so the plain alternation finds the hit position and
+# the per-keyword patterns are only consulted afterwards to name it. The prefilter is the same
+# alternation without \b assertions (a superset) and is the fast path for transcripts with no hit.
+FIRE_KEYWORD_PREFILTER = re.compile('|'.join(pattern.replace(r'\b', '') for pattern in FIRE_MATCH_PATTERNS))
+FIRE_KEYWORD_REGEX = re.compile('|'.join(FIRE_MATCH_PATTERNS))
+FIRE_KEYWORD_PATTERNS = [re.compile(pattern) for pattern in FIRE_MATCH_PATTERNS]
+KeywordMatch = namedtuple('KeywordMatch', ['keyword', 'text', 'span'])
+
+def find_fire_keyword(transcript):
+    # Returns the first keyword hit (pattern, matched text and span in the lowercased transcript) or None
     if not transcript:
-        return False
+        return None
     transcript_lower = transcript.lower()
-    for pattern in FIRE_KEYWORDS:
-        if re.search(pattern, transcript_lower):
-            return True
-    if re.search(r'out[\s_-]?of[\s_-]?control[\s_-]?burn', transcript_lower):
-        return True
-    return False
+    candidate = FIRE_KEYWORD_PREFILTER.search(transcript_lower)
+    if candidate is None:
+        return None
+    match = FIRE_KEYWORD_REGEX.search(transcript_lower, candidate.start())
+    if match is None:
+        return None
+    for i, pattern in enumerate(FIRE_KEYWORD_PATTERNS):
+        keyword_match = pattern.match(transcript_lower, match.start())
+        if keyword_match:
+            return KeywordMatch(FIRE_MATCH_PATTERNS[i], keyword_match.group(), keyword_match.span())
+    return None
+
+def is_fire_call_in_transcript(transcript):
+    return find_fire_keyword(transcript) is not None
+
+@metrics.timed('decode')
+def decode_audio_bytes(data, max_seconds=None, sampling_rate=WHISPER_SAMPLE_RATE, start_seconds=0):
+    # Decode straight from memory into the mono float32 buffer Whisper expects,
+    # stopping as soon as max_seconds of audio has been produced. With start_seconds the
+    # container seeks to the nearest frame first, so later windows skip decoding the head.
+    max_samples = int(max_seconds * sampling_rate) if max_seconds else None
+    resampler = av.AudioResampler(format='flt', layout='mono', rate=sampling_rate)
+    chunks = []
+    total_samples = 0
+    with av.open(io.BytesIO(data), mode='r', metadata_errors='ignore') as container:
+        stream = container.streams.audio[0]
+        skip_samples = 0
+        if start_seconds:
+            container.seek(int(start_seconds / stream.time_base), stream=stream)
+        frames = container.decode(stream)
+        reached_limit = False
+        for frame in frames:
+            if start_seconds and not chunks and frame.time is not None:
+                # The seek lands on a frame at or before the target; drop the samples in between
+                skip_samples = max(0, int((start_seconds - frame.time) * sampling_rate))
+            for resampled in resampler.resample(frame):
+                chunk = resampled.to_ndarray().reshape(-1)
+                chunks.append(chunk)
+                total_samples += len(chunk)
+            if max_samples is not None and total_samples >= skip_samples + max_samples:
+                reached_limit = True
+                break
+        if not reached_limit:
+            for resampled in resampler.resample(None):
+                chunks.append(resampled.to_ndarray().reshape(-1))
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+    audio = np.concatenate(chunks)[skip_samples:]
+    if max_samples is not None:
+        audio = audio[:max_samples]
+    return audio.astype(np.float32, copy=False)
+
+class WhisperModelManager:
+    # Loads the shared Whisper model exactly once (normally in the background at start-up),
+    # runs a short warm-up transcription, and records how long both took.
+    def __init__(self, model_size_or_path, device, compute_type, cpu_threads, num_workers,
+                 download_root=None, local_files_only=False):
+        self.model_size_or_path = model_size_or_path
+        self.device = device
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+        self.download_root = download_root
+        self.local_files_only = local_files_only
+        self._model = None
+        self._lock = threading.Lock()
+        self.status = 'not_loaded'
+        self.error = None
+        self.load_seconds = None
+        self.warmup_seconds = None
+
+    def get(self):
+        # Callers that arrive while the background load is running wait on the lock
+        with self._lock:
+            if self._model is None:
+                self._load_locked()
+            return self._model
+
+    def _load_locked(self):
+        logging.info(f"Loading Whisper model {self.model_size_or_path} ({self.compute_type}, "
+                     f"{self.num_workers} workers, {self.cpu_threads} threads each)...")
+        self.status = 'loading'
+        started = time.time()
+        try:
+            model = WhisperModel(self.model_size_or_path, device=self.device, compute_type=self.compute_type,
+                                 cpu_threads=self.cpu_threads, num_workers=self.num_workers,
+                                 download_root=self.download_root, local_files_only=self.local_files_only)
+        except Exception as e:
+            self.status = 'error'
+            self.error = str(e)
+            raise
+        self.load_seconds = round(time.time() - started, 2)
+        self.status = 'warming_up'
+        started = time.time()
+        segments, info = model.transcribe(np.zeros(WHISPER_SAMPLE_RATE, dtype=np.float32), beam_size=1,
+                                          language="en", vad_filter=False)
+        list(segments)
+        self.warmup_seconds = round(time.time() - started, 2)
+        self._model = model
+        self.status = 'ready'
+        self.error = None
+        logging.info(f"Whisper model loaded in {self.load_seconds}s, warmed up in {self.warmup_seconds}s")
+
+    def start_background_load(self):
+        def load():
+            try:
+                self.get()
+            except Exception as e:
+                logging.error(f"Failed to load Whisper model: {str(e)}")
+        threading.Thread(target=load, name="whisper-preload", daemon=True).start()
+
+    def health(self):
+        return {
+            'model': self.model_size_or_path,
+            'device': self.device,
+            'compute_type': self.compute_type,
+            'cpu_threads': self.cpu_threads,
+            'num_workers': self.num_workers,
+            'status': self.status,
+            'error': self.error,
+            'load_seconds': self.load_seconds,
+            'warmup_seconds': self.warmup_seconds
+        }
+
+
+whisper_models = WhisperModelManager(WHISPER_MODEL, WHISPER_DEVICE, WHISPER_COMPUTE_TYPE, WHISPER_CPU_THREADS,
+                                     WHISPER_NUM_WORKERS, WHISPER_DOWNLOAD_ROOT, WHISPER_LOCAL_FILES_ONLY)
+
+def load_whisper_model():
+    return whisper_models.get()
+
+@metrics.timed('download')
+def download_audio(audio_url):
+    if audio_prefetcher.running:
+        return audio_prefetcher.get(audio_url)
+    response = http_session.get(audio_url, timeout=30)
+    response.raise_for_status()
+    return response.content
+
+@metrics.timed('inference')
+def run_whisper(model, audio):
+    # process_time is CPU for the whole process, so with several workers busy it over-counts;
+    # it is still the best cheap signal for how much a clip costs.
+    cpu_started = time.process_time()
+    wall_started = time.time()
+    early_exit = False
+    refined = False
+    if STREAMING_DETECTION:
+        transcript, early_exit = stream_transcribe(model, audio)
+        if early_exit and REFINE_BEAM_SIZE > 1:
+            # Candidate hit from the greedy pass: redo the clip with beam search for an accurate transcript
+            segments, info = model.transcribe(audio, beam_size=REFINE_BEAM_SIZE, language="en", vad_filter=WHISPER_VAD_FILTER)
+            refined_transcript = " ".join(segment.text for segment in segments).strip()
+            if find_fire_keyword(refined_transcript):
+                transcript = refined_transcript
+                refined = True
+            else:
+                # Beam search decoded the keyword differently; keep the greedy hit rather than lose the detection
+                logging.info(f"Refinement dropped the keyword, keeping greedy transcript: {transcript}")
+    else:
+        segments, info = model.transcribe(audio, beam_size=5, language="en", vad_filter=WHISPER_VAD_FILTER)
+        transcript = " ".join(segment.text for segment in segments).strip()
+    with detection_stats_lock:
+        detection_stats['calls'] += 1
+        detection_stats['early_exits'] += early_exit
+        detection_stats['refinements'] += refined
+        detection_stats['cpu_seconds'] += time.process_time() - cpu_started
+        detection_stats['wall_seconds'] += time.time() - wall_started
+    return transcript
+
+def stream_transcribe(model, audio):
+    # Greedy pass that checks the keyword matcher as each segment is decoded and stops the
+    # generator (and with it the decoding) at the first hit. Returns (transcript, hit).
+    segments, info = model.transcribe(audio, beam_size=1, language="en", vad_filter=WHISPER_VAD_FILTER)
+    transcript_parts = []
+    for segment in segments:
+        transcript_parts.append(segment.text)
+        # Check the last two segments together so a keyword split across a boundary still matches
+        if find_fire_keyword(" ".join(transcript_parts[-2:])):
+            return " ".join(transcript_parts).strip(), True
+    return " ".join(transcript_parts).strip(), False
+
+def detection_health():
+    with detection_stats_lock:
+        stats = dict(detection_stats)
+    calls = stats['calls']
+    return {
+        'streaming': STREAMING_DETECTION,
+        'vad_filter': WHISPER_VAD_FILTER,
+        'refine_beam_size': REFINE_BEAM_SIZE,
+        'calls': calls,
+        'early_exits': stats['early_exits'],
+        'refinements': stats['refinements'],
+        'avg_cpu_seconds_per_call': round(stats['cpu_seconds'] / calls, 2) if calls else 0.0,
+        'avg_wall_seconds_per_call': round(stats['wall_seconds'] / calls, 2) if calls else 0.0
+    }
+
+def transcribe_audio_bytes(audio_url, data, max_seconds=25):
+    digest = hashlib.sha256(data).hexdigest()
+    cached = transcript_cache.get_by_hash(digest, max_seconds)
+    if cached is not None:
+        transcript_cache.record_hit(cached['transcribe_seconds'])
+        return cached['transcript']
+    transcript_cache.record_miss()
+    model = load_whisper_model()
+    started = time.time()
+    audio = decode_audio_bytes(data, max_seconds=max_seconds)
+    transcript = run_whisper(model, audio)
+    transcript_cache.put(audio_url, digest, len(data), len(audio) / WHISPER_SAMPLE_RATE, max_seconds,
+                         transcript, time.time() - started)
+    return transcript
 
 def transcribe_audio_with_whisper(audio_url, max_seconds=25):
-    global whisper_model
-    if whisper_model is None:
-        logging.info("Loading Whisper model...")
-        whisper_model = WhisperModel("small", device="cpu", compute_type="int8")
-        logging.info("Whisper model loaded successfully")
-    tmp_path = None
-    trimmed_path = None
     try:
-        response = requests.get(audio_url, timeout=30)
-        response.raise_for_status()
-        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as tmp_file:
-            tmp_file.write(response.content)
-            tmp_path = tmp_file.name
-        audio = AudioSegment.from_mp3(tmp_path)
-        max_ms = max_seconds * 1000
-        if len(audio) > max_ms:
-            trimmed_audio = audio[:max_ms]
-            with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as trimmed_file:
-                trimmed_audio.export(trimmed_file.name, format="mp3")
-                trimmed_path = trimmed_file.name
-            transcribe_file = trimmed_path
-        else:
-            transcribe_file = tmp_path
-        segments, info = whisper_model.transcribe(transcribe_file, beam_size=5, language="en")
-        transcript_parts = [segment.text for segment in segments]
-        transcript = " ".join(transcript_parts).strip()
-        if tmp_path and os.path.exists(tmp_path):
-            os.unlink(tmp_path)
-        if trimmed_path and os.path.exists(trimmed_path):
-            os.unlink(trimmed_path)
-        return transcript
+        return transcribe_audio_bytes(audio_url, download_audio(audio_url), max_seconds)
     except Exception as e:
         logging.error(f"Transcription error for {audio_url}: {str(e)}")
-        if tmp_path and os.path.exists(tmp_path):
-            os.unlink(tmp_path)
-        if trimmed_path and os.path.exists(trimmed_path):
-            os.unlink(trimmed_path)
         return None
 
-def is_ems_only_agency(agency_name):
-    agency_lower = agency_name.lower()
-    fire_keywords = [
-        r'\bfire\b', r'\bfd\b', r'\bvfd\b',
-        r'fire[-_\s]?dept', r'fire[-_\s]?department',
-        r'fire[-_\s]?rescue', r'fire[-_\s]?ems',
-        r'fire[-_\s]?district'
-    ]
-    has_fire = any(re.search(pattern, agency_lower) for pattern in fire_keywords)
-    if has_fire:
-        return False
-    obvious_ems_patterns = [
-        r'(^|[-_\s])ems([-_\s]|$)', r'(^|[-_\s])ambulance([-_\s]|$)',
-        r'(^|[-_\s])medic([-_\s]|$)', r'(^|[-_\s])paramedic',
-        r'(^|[-_\s])emt([-_\s]|$)', r'medical[-_\s]service',
-        r'emergency[-_\s]medical[-_\s]service'
+def recheck_call_audio(audio_url, max_seconds=25):
+    # Returns a new transcript when the audio grew in a way that can change it, otherwise None.
+    # Clips already decoded up to max_seconds can't change; for shorter ones a HEAD request tells
+    # us whether bytes were appended, and only the appended tail is fetched and transcribed.
+    entry = transcript_cache.get(audio_url)
+    if entry is None or entry['max_seconds'] not in (max_seconds, LONG_AUDIO_MAX_SECONDS):
+        return transcribe_audio_with_whisper(audio_url, max_seconds)
+    # Entries extended by long-audio windows are checked against the long cap
+    max_seconds = entry['max_seconds']
+    if entry['audio_seconds'] >= max_seconds:
+        transcript_cache.record_hit(entry['transcribe_seconds'])
+        return None
+    try:
+        # Entries that stopped mid-file (long-audio windows) have no byte offset to resume from
+        length = 0
+        if entry['byte_length'] is not None:
+            head = http_session.head(audio_url, timeout=10, allow_redirects=True)
+            length = int(head.headers.get('Content-Length', 0)) if head.ok else 0
+        if length and length <= entry['byte_length']:
+            transcript_cache.record_hit(entry['transcribe_seconds'])
+            return None
+        if length:
+            response = http_session.get(audio_url, headers={'Range': f"bytes={entry['byte_length']}-"}, timeout=30)
+            if response.status_code == 206:
+                tail = response.content
+                started = time.time()
+                try:
+                    audio = decode_audio_bytes(tail, max_seconds=max_seconds - entry['audio_seconds'])
+                except Exception as e:
+                    # Some containers can't be decoded from a mid-file offset; compare the full file instead
+                    logging.info(f"Tail decode failed for {audio_url}, re-checking full file: {str(e)}")
+                    audio = None
+            else:
+                audio = None
+            if audio is not None:
+                tail_transcript = run_whisper(load_whisper_model(), audio) if len(audio) else ''
+                transcript = f"{entry['transcript']} {tail_transcript}".strip()
+                # The full file's hash is unknown without its head bytes, so the entry drops out of the hash index
+                transcript_cache.put(audio_url, None, entry['byte_length'] + len(tail),
+                                     entry['audio_seconds'] + len(audio) / WHISPER_SAMPLE_RATE, max_seconds,
+                                     transcript, entry['transcribe_seconds'] + time.time() - started)
+                transcript_cache.record_tail_update(entry['transcribe_seconds'])
+                return transcript
+        # No usable Content-Length, no range support or an undecodable tail: compare the full download
+        data = download_audio(audio_url)
+        if entry['sha256'] and hashlib.sha256(data).hexdigest() == entry['sha256']:
+            transcript_cache.record_hit(entry['transcribe_seconds'])
+            return None
+        return transcribe_audio_bytes(audio_url, data, max_seconds)
+    except Exception as e:
+        logging.error(f"Re-check error for {audio_url}: {str(e)}")
+        return None
+
+def stitch_transcripts(previous, addition, join_words=10):
+    # Join consecutive window transcripts, dropping the words the overlap made Whisper say twice.
+    # The overlap (3s, ~10 words) has to sit at the join: a run of matching words that ends within
+    # the last join_words of previous and starts within the first join_words of addition. Boundary
+    # words often differ slightly, so the run needn't touch either edge; the one closest to the
+    # join wins, so an address repeated elsewhere in the call can't swallow the text in between.
+    previous_words = previous.split()
+    addition_words = addition.split()
+    normalize = lambda words: [re.sub(r'[^\w]', '', word.lower()) for word in words]
+    tail = normalize(previous_words[-join_words:])
+    head = normalize(addition_words[:join_words])
+    min_size = 1 if len(head) <= 2 else 2
+    best = None  # (distance from the join, -size, tail index, head index, size)
+    for i in range(len(tail)):
+        for j in range(len(head)):
+            size = 0
+            while i + size < len(tail) and j + size < len(head) and tail[i + size] and tail[i + size] == head[j + size]:
+                size += 1
+            if size >= min_size:
+                candidate = ((len(tail) - i - size) + j, -size, i, j, size)
+                best = min(best, candidate) if best else candidate
+    if best is None:
+        return ' '.join(previous_words + addition_words)
+    _, _, i, j, size = best
+    kept = len(previous_words) - len(tail) + i + size
+    return ' '.join(previous_words[:kept] + addition_words[j + size:])
+
+def transcribe_audio_window(audio_url, start_seconds):
+    # Transcribe one later window of a long call and stitch it onto the cached transcript.
+    # Returns (transcript, more) where more says whether audio continues past this window.
+    entry = transcript_cache.get(audio_url)
+    if entry is None:
+        return None, False
+    try:
+        data = download_audio(audio_url)
+        window_seconds = min(BATCH_CLIP_MAX_SECONDS, LONG_AUDIO_MAX_SECONDS - start_seconds)
+        started = time.time()
+        audio = decode_audio_bytes(data, max_seconds=window_seconds, start_seconds=start_seconds)
+        if len(audio) == 0:
+            return None, False
+        window_transcript = run_whisper(load_whisper_model(), audio)
+        transcript = stitch_transcripts(entry['transcript'], window_transcript)
+        if find_fire_keyword(window_transcript) and not find_fire_keyword(transcript):
+            # Never let stitching cost a detection: fall back to plain concatenation
+            transcript = f"{entry['transcript']} {window_transcript}".strip()
+        end_seconds = start_seconds + len(audio) / WHISPER_SAMPLE_RATE
+        more = len(audio) >= int(window_seconds * WHISPER_SAMPLE_RATE) and end_seconds < LONG_AUDIO_MAX_SECONDS
+        # The bytes covered are only known when the window ran to the end of the audio; otherwise
+        # byte_length stays unset so a recheck can't mistake appended bytes for what follows end_seconds
+        byte_length = len(data) if len(audio) < int(window_seconds * WHISPER_SAMPLE_RATE) else None
+        transcript_cache.put(audio_url, hashlib.sha256(data).hexdigest(), byte_length, end_seconds,
+                             LONG_AUDIO_MAX_SECONDS, transcript, entry['transcribe_seconds'] + time.time() - started)
+        return transcript, more
+    except Exception as e:
+        logging.error(f"Window transcription error for {audio_url} at {start_seconds:.0f}s: {str(e)}")
+        return None, False
+
+def transcribe_audio_batch(audio_urls, max_seconds=25):
+    # Concatenate the clips and hand faster-whisper one clip_timestamps entry per call,
+    # so all of them go through the encoder and decoder as a single batch.
+    model = load_whisper_model()
+    results = {audio_url: None for audio_url in audio_urls}
+    max_seconds = min(max_seconds, BATCH_CLIP_MAX_SECONDS)
+    clips = []
+    clip_urls = []
+    clip_starts = []
+    clip_sources = []  # (sha256, byte length) for the transcript cache
+    position = 0
+    for audio_url in audio_urls:
+        try:
+            data = download_audio(audio_url)
+            digest = hashlib.sha256(data).hexdigest()
+            cached = transcript_cache.get_by_hash(digest, max_seconds)
+            if cached is not None:
+                transcript_cache.record_hit(cached['transcribe_seconds'])
+                results[audio_url] = cached['transcript']
+                continue
+            transcript_cache.record_miss()
+            audio = decode_audio_bytes(data, max_seconds=max_seconds)
+        except Exception as e:
+            logging.error(f"Transcription error for {audio_url}: {str(e)}")
+            continue
+        if len(audio) == 0:
+            results[audio_url] = ""
+            continue
+        clips.append(audio)
+        clip_urls.append(audio_url)
+        clip_starts.append(position / WHISPER_SAMPLE_RATE)
+        clip_sources.append((digest, len(data)))
+        position += len(audio)
+    if not clips:
+        return results
+    started = time.time()
+    clip_timestamps = [
+        {'start': start, 'end': start + len(clip) / WHISPER_SAMPLE_RATE}
+        for start, clip in zip(clip_starts, clips)
     ]
-    has_obvious_ems = any(re.search(pattern, agency_lower) for pattern in obvious_ems_patterns)
-    return has_obvious_ems
+    try:
+        pipeline = BatchedInferencePipeline(model=model)
+        segments, info = pipeline.transcribe(np.concatenate(clips), language="en", beam_size=5,
+                                             batch_size=len(clips), clip_timestamps=clip_timestamps,
+                                             without_timestamps=True)
+        transcript_parts = {audio_url: [] for audio_url in clip_urls}
+        for segment in segments:
+            clip_index = max(0, bisect.bisect_right(clip_starts, segment.start + 0.001) - 1)
+            transcript_parts[clip_urls[clip_index]].append(segment.text)
+        per_clip_seconds = (time.time() - started) / len(clips)
+        metrics.observe('inference', time.time() - started)
+        for audio_url, clip, (digest, byte_length) in zip(clip_urls, clips, clip_sources):
+            results[audio_url] = " ".join(transcript_parts[audio_url]).strip()
+            transcript_cache.put(audio_url, digest, byte_length, len(clip) / WHISPER_SAMPLE_RATE, max_seconds,
+                                 results[audio_url], per_clip_seconds)
+    except Exception as e:
+        logging.error(f"Batched transcription error for {len(clips)} calls: {str(e)}")
+    return results
+
+AGENCY_FIRE_REGEX = re.compile('|'.join([
+    r'\bfire\b', r'\bfd\b', r'\bvfd\b',
+    r'fire[-_\s]?dept', r'fire[-_\s]?department',
+    r'fire[-_\s]?rescue', r'fire[-_\s]?ems',
+    r'fire[-_\s]?district'
+]))
+AGENCY_EMS_REGEX = re.compile('|'.join([
+    r'(^|[-_\s])ems([-_\s]|$)', r'(^|[-_\s])ambulance([-_\s]|$)',
+    r'(^|[-_\s])medic([-_\s]|$)', r'(^|[-_\s])paramedic',
+    r'(^|[-_\s])emt([-_\s]|$)', r'medical[-_\s]service',
+    r'emergency[-_\s]medical[-_\s]service'
+]))
+
+@functools.lru_cache(maxsize=4096)
+def classify_agency(agency_name):
+    # 'fire', 'ems' or 'other'; the feed repeats the same few hundred agencies, so results are memoized
+    agency_lower = agency_name.lower()
+    if AGENCY_FIRE_REGEX.search(agency_lower):
+        return 'fire'
+    if AGENCY_EMS_REGEX.search(agency_lower):
+        return 'ems'
+    return 'other'
+
+def is_ems_only_agency(agency_name):
+    return classify_agency(agency_name) == 'ems'
 
 def cleanup_old_calls():
-    global fire_calls
-    if len(fire_calls) <= 5:
-        return
     try:
-        now = datetime.now(pytz.UTC)
-        one_hour_ago = now - timedelta(hours=1)
-        old_calls = []
-        recent_calls = []
-        for call in fire_calls:
-            if 'first_detected' in call:
-                first_detected = datetime.fromisoformat(call['first_detected'].replace('Z', '+00:00')).replace(tzinfo=pytz.UTC)
-                if first_detected < one_hour_ago:
-                    old_calls.append(call)
-                else:
-                    recent_calls.append(call)
-        calls_to_keep = recent_calls + fire_calls[-5:]
-        seen_ids = set()
-        unique_calls = []
-        for call in calls_to_keep:
-            if call['id'] not in seen_ids:
-                seen_ids.add(call['id'])
-                unique_calls.append(call)
-        removed_count = len(fire_calls) - len(unique_calls)
+        removed_count = fire_calls.cleanup(max_age_seconds=3600, keep_latest=5)
         if removed_count > 0:
-            fire_calls = unique_calls
             logging.info(f"Cleaned up {removed_count} old calls (keeping {len(fire_calls)} calls)")
     except Exception as e:
         logging.error(f"Error during cleanup: {str(e)}")
 
-def process_call_queue():
-    global fire_calls
-    if not processing_lock.acquire(blocking=False):
+def process_call(call_info):
+    logging.info(f"Processing queued call from {call_info['agency']} at {call_info['location']}")
+    transcript = transcribe_audio_with_whisper(call_info['audio_url'], max_seconds=25)
+    record_transcript(call_info, transcript)
+    queue_next_window(call_info)
+
+def process_call_batch(calls):
+    logging.info(f"Processing batch of {len(calls)} queued calls")
+    transcripts = transcribe_audio_batch([c['audio_url'] for c in calls], max_seconds=BATCH_CLIP_MAX_SECONDS)
+    for call_info in calls:
+        record_transcript(call_info, transcripts.get(call_info['audio_url']))
+        queue_next_window(call_info)
+
+def queue_next_window(call_info):
+    # Long calls whose first pass filled its cap get their next overlapping window queued at
+    # low priority; calls already detected as fires don't need the rest of their audio
+    if LONG_AUDIO_MAX_SECONDS <= BATCH_CLIP_MAX_SECONDS or call_info['audio_url'] in fire_calls:
         return
+    entry = transcript_cache.get(call_info['audio_url'])
+    if entry is None or entry['audio_seconds'] >= LONG_AUDIO_MAX_SECONDS:
+        return
+    if entry['max_seconds'] != LONG_AUDIO_MAX_SECONDS and entry['audio_seconds'] < entry['max_seconds']:
+        return  # the first pass ran out of audio before its cap
+    window_call = {k: v for k, v in call_info.items() if k != 'enqueued_at'}
+    window_call['window_start'] = entry['audio_seconds'] - LONG_AUDIO_OVERLAP_SECONDS
+    call_queue.put_deferred(window_call)
+
+def process_call_window(call_info):
+    logging.info(f"Processing window at {call_info['window_start']:.0f}s of call from {call_info['agency']}")
+    transcript, more = transcribe_audio_window(call_info['audio_url'], call_info['window_start'])
+    if transcript is None:
+        return
+    record_transcript(call_info, transcript)
+    if more:
+        queue_next_window(call_info)
+
+def record_transcript(call_info, transcript):
+    processed_audio_urls.add(call_info['audio_url'])
+    if transcript is not None:
+        metrics.inc('watchduty_calls_transcribed_total')
+    with metrics.time('keyword_match'):
+        keyword_match = find_fire_keyword(transcript)
+    if keyword_match:
+        call_id = call_info['audio_url']
+        existing_call = fire_calls.get(call_id)
+        if existing_call:
+            if existing_call.get('transcript') != transcript:
+                fire_calls.update(call_id, transcript=transcript, matched_keyword=keyword_match.text)
+                logging.info(f"🔄 UPDATED: {call_info['agency']} - {call_info['location']}")
+                logging.info(f"   New transcript (25s): {transcript[:100]}...")
+        else:
+            call_data = {
+                'audio_url': call_info['audio_url'],
+                'agency': call_info['agency'],
+                'location': call_info['location'],
+                'state': call_info['state'],
+                'timestamp': call_info['timestamp'],
+                'transcript': transcript,
+                'matched_keyword': keyword_match.text,
+                'first_detected': datetime.now(pytz.UTC).isoformat() + 'Z',
+                'id': call_info['audio_url'],
+                'acknowledged': False
+            }
+            if fire_calls.add(call_data):
+                metrics.inc('watchduty_calls_detected_total')
+                logging.info(f"🔥 FIRE CALL DETECTED: {call_info['agency']} - {call_info['location']} (matched '{keyword_match.text}')")
+                logging.info(f"   Transcript (25s): {transcript[:100]}...")
+    else:
+        logging.info(f"❌ No fire keywords detected in {call_info['agency']}")
+        logging.info(f"   Transcript: {(transcript or '')[:150]}...")
+
+@profiled
+def run_queued_calls(calls):
+    started = time.time()
+    for call_info in calls:
+        metrics.observe('queue_wait', started - call_info.get('enqueued_at', started))
+    with pipeline_stats_lock:
+        pipeline_stats['busy_workers'] += 1
     try:
-        processed_count = 0
-        max_per_cycle = 5
-        while processed_count < max_per_cycle:
-            with queue_lock:
-                if not call_queue:
-                    break
-                call_info = call_queue.popleft()
-            logging.info(f"Processing queued call from {call_info['agency']} at {call_info['location']}")
-            transcript = transcribe_audio_with_whisper(call_info['audio_url'], max_seconds=25)
-            processed_audio_urls.add(call_info['audio_url'])
-            if transcript and is_fire_call_in_transcript(transcript):
-                call_id = call_info['audio_url']
-                existing_call = next((c for c in fire_calls if c['id'] == call_id), None)
-                if existing_call:
-                    if existing_call.get('transcript') != transcript:
-                        existing_call['transcript'] = transcript
-                        logging.info(f"🔄 UPDATED: {call_info['agency']} - {call_info['location']}")
-                        logging.info(f"   New transcript (25s): {transcript[:100]}...")
-                else:
-                    call_data = {
-                        'audio_url': call_info['audio_url'],
-                        'agency': call_info['agency'],
-                        'location': call_info['location'],
-                        'state': call_info['state'],
-                        'timestamp': call_info['timestamp'],
-                        'transcript': transcript,
-                        'first_detected': datetime.now(pytz.UTC).isoformat() + 'Z',
-                        'id': call_info['audio_url'],
-                        'acknowledged': False
-                    }
-                    fire_calls.insert(0, call_data)
-                    logging.info(f"🔥 FIRE CALL DETECTED: {call_info['agency']} - {call_info['location']}")
-                    logging.info(f"   Transcript (25s): {transcript[:100]}...")
-            else:
-                logging.info(f"❌ No fire keywords detected in {call_info['agency']}")
-                logging.info(f"   Transcript: {transcript[:150]}...")
-            processed_count += 1
-            time.sleep(1)
-        if processed_count > 0:
-            with queue_lock:
-                queue_size = len(call_queue)
-            logging.info(f"Queue processing: {processed_count} calls processed, {queue_size} remaining in queue")
+        if 'window_start' in calls[0]:
+            process_call_window(calls[0])
+        elif len(calls) == 1:
+            process_call(calls[0])
+        else:
+            process_call_batch(calls)
     except Exception as e:
-        logging.error(f"Error processing queue: {str(e)}")
+        logging.error(f"Error processing {len(calls)} calls: {str(e)}")
     finally:
-        processing_lock.release()
+        finished = time.time()
+        for call_info in calls:
+            call_queue.task_done(call_info)
+        with pipeline_stats_lock:
+            pipeline_stats['busy_workers'] -= 1
+            pipeline_stats['processed'] += len(calls)
+            for call_info in calls:
+                recent_latencies.append((started - call_info.get('enqueued_at', started), finished - started))
+        for call_info in calls:
+            metrics.observe('end_to_end', finished - call_info.get('enqueued_at', started))
+
+def transcription_worker(stop_event):
+    while not stop_event.is_set():
+        calls = call_queue.get_batch(TRANSCRIBE_BATCH_SIZE, timeout=1, max_wait=TRANSCRIBE_BATCH_MAX_WAIT)
+        if calls:
+            prefetch_upcoming_audio()
+            run_queued_calls(calls)
+
+def prefetch_upcoming_audio():
+    audio_prefetcher.prefetch([c['audio_url'] for c in call_queue.peek(AUDIO_PREFETCH_COUNT)],
+                              in_flight=call_queue.in_flight_urls())
+
+def process_call_queue(max_calls=None):
+    # Synchronously drain the queue on the calling thread (workers normally do this continuously)
+    processed_count = 0
+    while max_calls is None or processed_count < max_calls:
+        batch_size = TRANSCRIBE_BATCH_SIZE if max_calls is None else min(TRANSCRIBE_BATCH_SIZE, max_calls - processed_count)
+        calls = call_queue.get_batch(batch_size, timeout=0)
+        if not calls:
+            break
+        run_queued_calls(calls)
+        processed_count += len(calls)
+    if processed_count > 0:
+        logging.info(f"Queue processing: {processed_count} calls processed, {len(call_queue)} remaining in queue")
+    return processed_count
+
+worker_stop_event = threading.Event()
+worker_threads = []
+
+def start_transcription_workers():
+    for i in range(TRANSCRIBE_WORKERS):
+        worker = threading.Thread(target=transcription_worker, args=(worker_stop_event,),
+                                  name=f"transcriber-{i}", daemon=True)
+        worker.start()
+        worker_threads.append(worker)
+    logging.info(f"Started {TRANSCRIBE_WORKERS} transcription workers")
+
+def pipeline_health():
+    queue_stats = call_queue.stats()
+    with pipeline_stats_lock:
+        latencies = list(recent_latencies)
+        busy_workers = pipeline_stats['busy_workers']
+        processed = pipeline_stats['processed']
+    avg_wait = sum(l[0] for l in latencies) / len(latencies) if latencies else 0.0
+    avg_processing = sum(l[1] for l in latencies) / len(latencies) if latencies else 0.0
+    return {
+        'workers': TRANSCRIBE_WORKERS,
+        'batch_size': TRANSCRIBE_BATCH_SIZE,
+        'workers_busy': busy_workers,
+        'calls_processed': processed,
+        'queue_capacity': call_queue.maxsize,
+        'queue_in_flight': queue_stats['in_flight'],
+        'queue_oldest_wait_seconds': queue_stats['oldest_wait_seconds'],
+        'queue_per_state': queue_stats['per_state'],
+        'avg_queue_wait_seconds': round(avg_wait, 2),
+        'avg_processing_seconds': round(avg_processing, 2)
+    }
 
 def recheck_recent_calls():
-    global fire_calls
-    if not processing_lock.acquire(blocking=False):
-        logging.info("Re-check skipped - scan in progress")
+    if not recheck_lock.acquire(blocking=False):
+        logging.info("Re-check skipped - previous re-check still running")
         return
     try:
-        now = datetime.now(pytz.UTC)
-        cutoff_time = now - timedelta(minutes=10)
         updated_count = 0
-        for call in fire_calls:
-            if 'first_detected' in call:
-                first_detected = datetime.fromisoformat(call['first_detected'].replace('Z', '+00:00')).replace(tzinfo=pytz.UTC)
-                if first_detected > cutoff_time:
-                    logging.info(f"Re-checking audio for {call['agency']} at {call['location']}")
-                    new_transcript = transcribe_audio_with_whisper(call['audio_url'])
-                    if new_transcript and new_transcript != call.get('transcript', ''):
-                        old_length = len(call.get('transcript', ''))
-                        new_length = len(new_transcript)
-                        if new_length > old_length:
-                            call['transcript'] = new_transcript
-                            updated_count += 1
-                            logging.info(f"✓ Updated transcript for {call['agency']} ({old_length} -> {new_length} chars)")
+        for call in fire_calls.detected_since(time.time() - 600):
+            logging.info(f"Re-checking audio for {call['agency']} at {call['location']}")
+            new_transcript = recheck_call_audio(call['audio_url'])
+            if new_transcript and new_transcript != call.get('transcript', ''):
+                old_length = len(call.get('transcript', ''))
+                new_length = len(new_transcript)
+                if new_length > old_length:
+                    fire_calls.update(call['id'], transcript=new_transcript)
+                    updated_count += 1
+                    logging.info(f"✓ Updated transcript for {call['agency']} ({old_length} -> {new_length} chars)")
         if updated_count > 0:
             logging.info(f"Re-check complete. Updated {updated_count} calls with better audio")
         else:
@@ -261,120 +1679,309 @@ def recheck_recent_calls():
     except Exception as e:
         logging.error(f"Error during re-check: {str(e)}")
     finally:
-        processing_lock.release()
+        recheck_lock.release()
+
+def iter_call_log_rows(chunks):
+    # Incrementally parse the call log table, yielding rows as soon as each </tr> arrives
+    parser = etree.HTMLPullParser(events=('end',), tag='tr')
+
+    def parse_rows():
+        for _, row in parser.read_events():
+            cols = row.findall('td')
+            if len(cols) >= 4:
+                audio_tag = cols[0].find('.//audio')
+                if audio_tag is not None and audio_tag.get('src'):
+                    yield {
+                        'audio_url': audio_tag.get('src'),
+                        'agency': ''.join(cols[1].itertext()).strip(),
+                        'location': ''.join(cols[2].itertext()).strip(),
+                        'timestamp': ''.join(cols[3].itertext()).strip()
+                    }
+            row.clear()
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from parse_rows()
+    parser.close()
+    yield from parse_rows()
+
+def fetch_new_call_log_rows(limit, high_water_url=None):
+    # Returns None when the call log is unchanged, otherwise the rows newer than high_water_url
+    headers = {}
+    if call_log_state['etag']:
+        headers['If-None-Match'] = call_log_state['etag']
+    if call_log_state['last_modified']:
+        headers['If-Modified-Since'] = call_log_state['last_modified']
+    with metrics.time('scrape_fetch'):
+        response = http_session.get(CALL_LOG_URL, headers=headers, timeout=30)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        # The body is read in full so the keep-alive connection goes back to the pool;
+        # parsing still stops at the first row we have already seen.
+        content = response.content
+    call_log_state['etag'] = response.headers.get('ETag')
+    call_log_state['last_modified'] = response.headers.get('Last-Modified')
+    chunks = (content[i:i + 16384] for i in range(0, len(content), 16384))
+    rows = []
+    with metrics.time('parse'):
+        for row in iter_call_log_rows(chunks):
+            if row['audio_url'] == high_water_url or len(rows) >= limit:
+                break
+            rows.append(row)
+    return rows
 
 def scrape_dispatch_calls(max_rows=10, is_initial_scan=False):
     global check_start_time, check_finish_time, processed_audio_urls, state_call_tracking
     logging.info("Fetching dispatch data...")
+    if SHARED_STATE_DB:
+        sync_selected_states()
     try:
         check_start_time = datetime.now(pytz.UTC).isoformat() + 'Z'
-        url = "https://call-log-api.edispatches.com/calls/"
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        table = soup.find('table')
-        if table:
-            rows = table.find_all('tr')
-            scan_limit = max_rows if not is_initial_scan else 20
-            if is_initial_scan:
-                logging.info(f"Initial scan: checking last {scan_limit} calls (max 20 per selected state)...")
-            scan_calls_by_state = {}
-            for row in rows[:scan_limit]:
-                cols = row.find_all('td')
-                if len(cols) >= 4:
-                    audio_tag = cols[0].find('audio')
-                    if audio_tag and audio_tag.get('src'):
-                        audio_url = audio_tag.get('src')
-                        agency = cols[1].text.strip()
-                        location = cols[2].text.strip()
-                        timestamp_str = cols[3].text.strip()
-                        state = extract_state_from_location(location)
-                        with states_lock:
-                            state_is_selected = state in selected_states
-                        if not state_is_selected:
-                            processed_audio_urls.add(audio_url)  # Skip and mark as processed
-                            logging.info(f"Skipped call from {agency} in {state} - not in selected states")
-                            continue
-                        if is_ems_only_agency(agency):
-                            processed_audio_urls.add(audio_url)
-                            continue
-                        try:
-                            call_time = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S').replace(tzinfo=pytz.UTC)
-                        except:
-                            call_time = datetime.now(pytz.UTC)
-                        call_info = {
-                            'audio_url': audio_url,
-                            'agency': agency,
-                            'location': location,
-                            'state': state,
-                            'timestamp': timestamp_str,
-                            'call_time': call_time
-                        }
-                        if state not in scan_calls_by_state:
-                            scan_calls_by_state[state] = []
-                        scan_calls_by_state[state].append(call_info)
-            with queue_lock:
-                call_queue.clear()
-                for state, calls in scan_calls_by_state.items():
-                    calls.sort(key=lambda x: x['call_time'], reverse=True)
-                    recent_calls = calls[:MAX_CALLS_PER_STATE]
-                    for call_info in recent_calls:
-                        if call_info['audio_url'] not in processed_audio_urls:
-                            queue_call = {k: v for k, v in call_info.items() if k != 'call_time'}
-                            call_queue.append(queue_call)
-                queue_size = len(call_queue)
-                state_call_tracking = scan_calls_by_state
-            if queue_size > 0:
-                logging.info(f"Scan complete. Queue rebuilt: {queue_size} calls (max 20 per state)")
-            else:
-                logging.info(f"Scan complete. No new calls found")
+        scan_limit = max_rows if not is_initial_scan else 20
+        if is_initial_scan:
+            logging.info(f"Initial scan: checking last {scan_limit} calls (max 20 per selected state)...")
+        high_water_url = None if is_initial_scan else call_log_state['high_water_url']
+        rows = fetch_new_call_log_rows(scan_limit, high_water_url)
+        if rows is None:
+            logging.info("Scan complete. Call log unchanged since last scan")
+            return
+        scan_calls_by_state = {}
+        for row in rows:
+            audio_url = row['audio_url']
+            agency = row['agency']
+            location = row['location']
+            timestamp_str = row['timestamp']
+            if audio_url in processed_audio_urls:
+                continue
+            metrics.inc('watchduty_calls_scanned_total')
+            state = extract_state_from_location(location)
+            with states_lock:
+                state_is_selected = state in selected_states
+            if not state_is_selected:
+                processed_audio_urls.add(audio_url)  # Skip and mark as processed
+                metrics.inc('watchduty_calls_skipped_total', reason='state')
+                logging.info(f"Skipped call from {agency} in {state} - not in selected states")
+                continue
+            if is_ems_only_agency(agency):
+                processed_audio_urls.add(audio_url)
+                metrics.inc('watchduty_calls_skipped_total', reason='ems')
+                continue
+            try:
+                call_time = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S').replace(tzinfo=pytz.UTC)
+            except:
+                call_time = datetime.now(pytz.UTC)
+            call_info = {
+                'audio_url': audio_url,
+                'agency': agency,
+                'location': location,
+                'state': state,
+                'timestamp': timestamp_str,
+                'call_time': call_time
+            }
+            if state not in scan_calls_by_state:
+                scan_calls_by_state[state] = []
+            scan_calls_by_state[state].append(call_info)
+        queued_count = 0
+        dropped_count = 0
+        for state, calls in scan_calls_by_state.items():
+            calls.sort(key=lambda x: x['call_time'], reverse=True)
+            recent_calls = calls[:MAX_CALLS_PER_STATE]
+            for call_info in recent_calls:
+                queue_call = {k: v for k, v in call_info.items() if k != 'call_time'}
+                if call_queue.put(queue_call, call_time=call_info['call_time'].timestamp()):
+                    queued_count += 1
+                elif call_queue.is_full():
+                    dropped_count += 1
+        state_call_tracking = scan_calls_by_state
+        if queued_count > 0:
+            prefetch_upcoming_audio()
+        if dropped_count > 0:
+            # Keep the old high-water mark and drop the validators so the next scan walks these rows again
+            call_log_state['etag'] = None
+            call_log_state['last_modified'] = None
+            logging.warning(f"Queue full ({call_queue.maxsize}): deferred {dropped_count} calls to the next scan")
+        elif rows:
+            call_log_state['high_water_url'] = rows[0]['audio_url']
+        if queued_count > 0:
+            logging.info(f"Scan complete. {len(rows)} new rows, {queued_count} calls queued ({len(call_queue)} in queue)")
+        else:
+            logging.info(f"Scan complete. No new calls found")
         check_finish_time = datetime.now(pytz.UTC).isoformat() + 'Z'
     except Exception as e:
         logging.error(f"Error scraping dispatch calls: {str(e)}")
     finally:
         check_finish_time = datetime.now(pytz.UTC).isoformat() + 'Z'
 
+@functools.lru_cache(maxsize=64)
+def static_file_hash(filename, mtime):
+    with open(os.path.join(app.static_folder, filename), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+def current_static_hash(filename):
+    path = safe_join(app.static_folder, filename)
+    if path is None or not os.path.isfile(path):
+        return None
+    return static_file_hash(filename, os.path.getmtime(path))
+
+@app.context_processor
+def inject_static_url():
+    # Content-hashed asset URLs: a changed file gets a new URL, so old ones can be cached forever
+    def static_url(filename):
+        return f"/static/{filename}?v={current_static_hash(filename)}"
+    return {'static_url': static_url}
+
+def compress_body(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=5)
+    return gzip.compress(data, compresslevel=6)
+
+compress_static_body = functools.lru_cache(maxsize=64)(compress_body)  # static bodies repeat; API bodies don't
+
+@app.after_request
+def optimize_response(response):
+    if request.path.startswith('/static/'):
+        version = request.args.get('v')
+        if version:
+            # Only the current hash is immutable; an old ?v= (stale page, bookmark) gets today's file,
+            # which must not be cached under the old URL
+            if version == current_static_hash(request.path[len('/static/'):]):
+                response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+            else:
+                response.headers['Cache-Control'] = 'no-cache'
+        if request.path == '/static/sw.js':
+            response.headers['Service-Worker-Allowed'] = '/'  # lets the worker control the whole app
+    response.vary.add('Accept-Encoding')
+    accepted = request.accept_encodings
+    encoding = 'br' if brotli and accepted['br'] else 'gzip' if accepted['gzip'] else None
+    if (encoding is None or response.status_code != 200 or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    response.direct_passthrough = False  # static files are streamed; read them so they can be compressed
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_BYTES:
+        return response
+    compress = compress_static_body if request.path.startswith('/static/') else compress_body
+    response.set_data(compress(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(etag, weak=True)  # the compressed bytes differ from the identity representation
+    return response
+
 @app.route('/')
 def index():
+    # Revalidated on every load, but only re-sent when the page (or an asset hash in it) changed
     response = app.make_response(render_template('index.html'))
-    response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-    response.headers['Pragma'] = 'no-cache'
-    response.headers['Expires'] = '0'
-    return response
+    response.headers['Cache-Control'] = 'no-cache'
+    response.set_etag(hashlib.sha256(response.get_data()).hexdigest()[:16])
+    return response.make_conditional(request)
+
+def local_status():
+    return {
+        'check_start': check_start_time or datetime.now(pytz.UTC).isoformat() + 'Z',
+        'check_finish': check_finish_time or datetime.now(pytz.UTC).isoformat() + 'Z',
+        'queue_size': len(call_queue),
+        'pipeline': pipeline_health(),
+        'dedup': processed_audio_urls.stats(),
+        'transcript_cache': transcript_cache.stats(),
+        'detection': detection_health(),
+        'prefetch': audio_prefetcher.stats(),
+        'model': whisper_models.health()
+    }
+
+def current_status():
+    # Followers don't scrape or transcribe, so they report what the leader last published
+    if SHARED_STATE_DB and not is_leader:
+        published = fire_calls.get_meta('status')
+        if published:
+            return json.loads(published)
+    return local_status()
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    global fire_calls, check_start_time, check_finish_time
-    with queue_lock:
-        queue_size = len(call_queue)
-    return jsonify({
+    status = current_status()
+    status.update({
         'status': 'running',
-        'check_start': check_start_time or datetime.now(pytz.UTC).isoformat() + 'Z',
-        'check_finish': check_finish_time or datetime.now(pytz.UTC).isoformat() + 'Z',
-        'queue_size': queue_size
+        'leader': is_leader,
+        'worker_pid': os.getpid(),
+        'calls_per_state': fire_calls.state_counts()
     })
+    return jsonify(status)
+
+@app.route('/metrics')
+def prometheus_metrics():
+    queue_stats = call_queue.stats()
+    gauges = {
+        'watchduty_queue_depth': queue_stats['depth'],
+        'watchduty_queue_in_flight': queue_stats['in_flight'],
+        'watchduty_queue_oldest_wait_seconds': queue_stats['oldest_wait_seconds'],
+        'watchduty_fire_calls': len(fire_calls),
+        'watchduty_prefetch_buffered_bytes': audio_prefetcher.stats()['buffered_bytes'],
+        'watchduty_process_resident_memory_bytes': current_rss_bytes()
+    }
+    return Response(metrics.render(gauges), mimetype='text/plain; version=0.0.4')
 
 @app.route('/api/fire-calls')
 def get_fire_calls():
-    with queue_lock:
-        queue_size = len(call_queue)
-    return jsonify({
-        'calls': fire_calls,
-        'check_start': check_start_time or datetime.now(pytz.UTC).isoformat() + 'Z',
-        'check_finish': check_finish_time or datetime.now(pytz.UTC).isoformat() + 'Z',
-        'queue_size': queue_size
+    # ?since=<revision> returns only what changed after that revision; adding ?wait=<seconds>
+    # long-polls until something changes, so new detections reach clients immediately.
+    # A revision from another store epoch (e.g. before a restart) gets a full snapshot back. It still
+    # waits first: with several workers and no shared store every worker has its own epoch, and
+    # answering those polls immediately would turn the client's long-poll into a tight loop.
+    since = request.args.get('since', type=int)
+    epoch = request.args.get('epoch')
+    wait = min(request.args.get('wait', 0, type=float), LONG_POLL_MAX_SECONDS)
+    states = set(request.args.getlist('state'))
+    if epoch is not None and epoch != fire_calls.epoch:
+        if since is not None and wait > 0:
+            fire_calls.wait_for_change(fire_calls.revision, wait)
+        since = None
+    elif since is not None and wait > 0:
+        fire_calls.wait_for_change(since, wait)
+    snapshot = fire_calls.changes_since(since, states)
+    status = current_status()
+    response = jsonify({
+        'calls': [call_summary(call) for call in snapshot['calls']],
+        'removed': snapshot['removed'],
+        'full': snapshot['full'],
+        'revision': snapshot['revision'],
+        'epoch': fire_calls.epoch,
+        'check_start': status['check_start'],
+        'check_finish': status['check_finish'],
+        'queue_size': status['queue_size']
     })
+    response.headers['Cache-Control'] = 'no-cache'
+    response.set_etag(f"calls-{fire_calls.epoch}-{snapshot['revision']}")
+    return response.make_conditional(request)
 
 @app.route('/api/states')
 def get_states():
     return jsonify({'states': list(US_STATES.values())})
 
+def call_summary(call):
+    # List view: transcripts are cut to a preview; clients fetch the full call on demand
+    transcript = call.get('transcript') or ''
+    if len(transcript) <= TRANSCRIPT_PREVIEW_CHARS:
+        return call
+    summary = dict(call)
+    summary['transcript'] = transcript[:TRANSCRIPT_PREVIEW_CHARS].rsplit(' ', 1)[0] + '…'
+    summary['transcript_truncated'] = True
+    return summary
+
+@app.route('/api/fire-calls/<path:call_id>', methods=['GET'])
+def get_fire_call(call_id):
+    call = fire_calls.get(call_id)
+    if call is None:
+        return jsonify({'success': False, 'message': 'Call not found'}), 404
+    response = jsonify(call)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.add_etag()
+    return response.make_conditional(request)
+
 @app.route('/api/fire-calls/<path:call_id>', methods=['DELETE'])
 def delete_fire_call(call_id):
-    global fire_calls
-    original_count = len(fire_calls)
-    fire_calls = [call for call in fire_calls if call['id'] != call_id]
-    if len(fire_calls) < original_count:
+    if fire_calls.delete(call_id):
         return jsonify({'success': True, 'message': 'Call dismissed'})
     else:
         return jsonify({'success': False, 'message': 'Call not found'}), 404
@@ -389,17 +1996,14 @@ def update_state_filter():
             selected_states = set(states)
             if len(selected_states) > 4:
                 selected_states = set(list(selected_states)[:4])
-        with queue_lock:
-            filtered_queue = deque()
-            removed_count = 0
-            for call_info in call_queue:
-                if call_info['state'] in selected_states:
-                    filtered_queue.append(call_info)
-                else:
-                    removed_count += 1
-            call_queue.clear()
-            call_queue.extend(filtered_queue)
-            queue_size = len(call_queue)
+            current_states = set(selected_states)
+        removed_count = call_queue.retain_states(current_states)
+        queue_size = len(call_queue)
+        if SHARED_STATE_DB:
+            # The leader owns the queue; it picks the new filter up from the shared store
+            fire_calls.set_meta('selected_states', json.dumps(sorted(current_states)))
+            if not is_leader:
+                queue_size = current_status()['queue_size']
         print(f"State filter updated: {len(selected_states)} states selected, removed {removed_count} calls from queue")
         return jsonify({
             'success': True,
@@ -413,15 +2017,9 @@ def update_state_filter():
 
 @app.route('/api/fire-calls/<path:call_id>/acknowledge', methods=['POST'])
 def acknowledge_fire_call(call_id):
-    global fire_calls
-    for call in fire_calls:
-        if call['id'] == call_id:
-            call['acknowledged'] = True
-            return jsonify({'success': True, 'message': 'Call acknowledged'})
+    if fire_calls.acknowledge(call_id):
+        return jsonify({'success': True, 'message': 'Call acknowledged'})
     return jsonify({'success': False, 'message': 'Call not found'}), 404
-    
-scheduler = BackgroundScheduler({'apscheduler.job_defaults.max_instances': 3})
-# ... (all your existing code up to the scheduler definition)
 
 scheduler = BackgroundScheduler({'apscheduler.job_defaults.max_instances': 3})
 
@@ -438,25 +2036,101 @@ def initial_scan_job(scheduler_ref):
     except Exception as e:
         logging.warning(f"Failed to remove initial_scan job: {e}")
 
-# 1. Add recurring jobs
-scheduler.add_job(func=scrape_dispatch_calls, trigger="interval", seconds=60, max_instances=3)
-scheduler.add_job(func=process_call_queue, trigger="interval", seconds=30, max_instances=3)
-scheduler.add_job(func=recheck_recent_calls, trigger="interval", seconds=120, max_instances=3)
+def save_dedup_state():
+    processed_audio_urls.expire()
+    processed_audio_urls.save()
 
-# 2. Add the one-time initial scan job
-from datetime import datetime
-scheduler.add_job(
-    func=initial_scan_job, 
-    id='initial_scan', 
-    name='initial_scan', 
-    args=[scheduler], 
-    trigger='date', 
-    run_date=datetime.now()
-)
-
-# 3. Start the scheduler once
-logging.info("Starting BackgroundScheduler...")
-scheduler.start()
-
-# Everything is now configured correctly for Gunicorn to run 'app:app'
-# and the background tasks will execute robustly.
+def sync_selected_states():
+    # Pick up state filter changes POSTed to other gunicorn workers
+    global selected_states
+    published = fire_calls.get_meta('selected_states')
+    if not published:
+        return
+    states = set(json.loads(published))
+    with states_lock:
+        if states == selected_states:
+            return
+        selected_states = states
+    removed_count = call_queue.retain_states(states)
+    logging.info(f"State filter synced from shared store: {len(states)} states, removed {removed_count} calls from queue")
+
+def publish_shared_status():
+    try:
+        sync_selected_states()
+        fire_calls.set_meta('status', json.dumps(local_status()))
+    except Exception as e:
+        logging.error(f"Error publishing shared status: {str(e)}")
+
+def start_background_jobs():
+    whisper_models.start_background_load()
+    processed_audio_urls.load()
+    atexit.register(processed_audio_urls.save)
+
+    # 1. Add recurring jobs
+    scheduler.add_job(func=scrape_dispatch_calls, trigger="interval", seconds=60, max_instances=3)
+    scheduler.add_job(func=recheck_recent_calls, trigger="interval", seconds=120, max_instances=3)
+    scheduler.add_job(func=save_dedup_state, trigger="interval", seconds=60, max_instances=1)
+    if SHARED_STATE_DB:
+        scheduler.add_job(func=publish_shared_status, trigger="interval", seconds=SHARED_STATUS_INTERVAL, max_instances=1)
+
+    # 2. Add the one-time initial scan job
+    scheduler.add_job(
+        func=initial_scan_job,
+        id='initial_scan',
+        name='initial_scan',
+        args=[scheduler],
+        trigger='date',
+        run_date=datetime.now()
+    )
+
+    # 3. Start the scheduler, the audio prefetcher and the transcription workers once
+    logging.info("Starting BackgroundScheduler...")
+    scheduler.start()
+    audio_prefetcher.start()
+    start_transcription_workers()
+
+# Gunicorn imports this module once per worker. Only the worker holding the leader lock runs
+# the scheduler, the transcription workers and the Whisper model; the others only serve the
+# API from the shared store and keep retrying the lock so one of them takes over if the leader dies.
+is_leader = not LEADER_LOCK_PATH
+leader_lock_file = None
+
+def try_acquire_leadership():
+    global is_leader, leader_lock_file
+    if fcntl is None:
+        is_leader = True
+        return True
+    lock_file = open(LEADER_LOCK_PATH, 'a+')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    lock_file.seek(0)
+    lock_file.truncate()
+    lock_file.write(str(os.getpid()))
+    lock_file.flush()
+    leader_lock_file = lock_file  # keep the descriptor (and so the lock) for the life of the process
+    is_leader = True
+    return True
+
+def leader_election_loop():
+    while not try_acquire_leadership():
+        time.sleep(LEADER_RETRY_SECONDS)
+    logging.info(f"Worker {os.getpid()} took over as scheduler leader")
+    start_background_jobs()
+
+def start_leader_election():
+    if not LEADER_LOCK_PATH:
+        start_background_jobs()
+    elif try_acquire_leadership():
+        logging.info(f"Worker {os.getpid()} is the scheduler leader")
+        start_background_jobs()
+    else:
+        logging.info(f"Worker {os.getpid()} is a follower; serving API from {SHARED_STATE_DB}")
+        threading.Thread(target=leader_election_loop, name="leader-election", daemon=True).start()
+
+# Benchmarks and offline tools import this module with DISABLE_BACKGROUND_JOBS=1
+# to get the pipeline functions without the live scraper and workers.
+if os.environ.get('DISABLE_BACKGROUND_JOBS') != '1':
+    start_leader_election()
@@ -0,0 +1,90 @@
+"""Compare the old temp-file/pydub decode-and-trim path with the in-memory PyAV path.
+
+Usage: python benchmarks/bench_audio_decode.py [--iterations N] [--max-seconds S] [audio files...]
+
+Without audio files a synthetic 40s mp3 is generated. Only the audio preparation
+is timed; Whisper inference is identical for both paths and is left out.
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault('DISABLE_BACKGROUND_JOBS', '1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from faster_whisper import decode_audio  # noqa: E402
+
+from app import decode_audio_bytes  # noqa: E402
+from benchmarks.fixtures import load_audio_files  # noqa: E402
+
+
+def legacy_prepare(data, max_seconds):
+    # Mirrors the previous transcribe_audio_with_whisper: write, decode with pydub,
+    # re-encode the trimmed clip to a second temp file, then let Whisper decode it again.
+    from pydub import AudioSegment
+    tmp_path = None
+    trimmed_path = None
+    try:
+        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as tmp_file:
+            tmp_file.write(data)
+            tmp_path = tmp_file.name
+        audio = AudioSegment.from_mp3(tmp_path)
+        max_ms = max_seconds * 1000
+        transcribe_file = tmp_path
+        if len(audio) > max_ms:
+            with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as trimmed_file:
+                audio[:max_ms].export(trimmed_file.name, format="mp3")
+                trimmed_path = trimmed_file.name
+            transcribe_file = trimmed_path
+        return decode_audio(transcribe_file)
+    finally:
+        for path in (tmp_path, trimmed_path):
+            if path and os.path.exists(path):
+                os.unlink(path)
+
+
+def in_memory_prepare(data, max_seconds):
+    return decode_audio_bytes(data, max_seconds=max_seconds)
+
+
+def run(name, func, clips, iterations, max_seconds):
+    timings = []
+    peak_bytes = 0
+    for _ in range(iterations):
+        for _, data in clips:
+            tracemalloc.start()
+            started = time.perf_counter()
+            func(data, max_seconds)
+            timings.append(time.perf_counter() - started)
+            peak_bytes = max(peak_bytes, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    print(f"{name:<10} mean {statistics.mean(timings) * 1000:8.1f} ms   "
+          f"median {statistics.median(timings) * 1000:8.1f} ms   "
+          f"peak python alloc {peak_bytes / 1024:8.0f} KiB")
+    return statistics.mean(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('files', nargs='*')
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--max-seconds', type=int, default=25)
+    args = parser.parse_args()
+
+    clips = load_audio_files(args.files)
+    print(f"{len(clips)} clip(s), {args.iterations} iteration(s), trimmed to {args.max_seconds}s")
+    new_mean = run('in-memory', in_memory_prepare, clips, args.iterations, args.max_seconds)
+    if shutil.which('ffmpeg') is None:
+        print("legacy     skipped: pydub needs the ffmpeg binary on PATH")
+        return
+    legacy_mean = run('legacy', legacy_prepare, clips, args.iterations, args.max_seconds)
+    print(f"speedup    {legacy_mean / new_mean:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
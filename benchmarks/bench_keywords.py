@@ -0,0 +1,108 @@
+"""Micro-benchmark the fire keyword matcher and agency classifier.
+
+Usage: python benchmarks/bench_keywords.py [--transcripts N] [--repeat N]
+
+Compares the old per-pattern re.search loops with the single compiled
+alternation and the memoized agency classification, and checks both give the
+same answers on the corpus.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+os.environ.setdefault('DISABLE_BACKGROUND_JOBS', '1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+from benchmarks.fixtures import SAMPLE_AGENCIES, SAMPLE_LOCATIONS  # noqa: E402
+
+FILLER = [
+    'engine one respond', 'units responding to', 'caller reports', 'cross street is', 'copy that',
+    'en route', 'on scene', 'medic three', 'patient is conscious and breathing', 'fall victim',
+    'alarm activation', 'commercial building', 'stand by for further', 'ten four', 'dispatch clear',
+]
+HITS = ['brush fire', 'grass on fire', 'smoke showing', 'controlled burn', 'wild-fire', 'out of control burn',
+        'trees on fire', 'structures threatened']
+
+
+def make_corpus(count, seed=0):
+    rng = random.Random(seed)
+    transcripts = []
+    for i in range(count):
+        words = [rng.choice(FILLER) for _ in range(rng.randint(4, 14))]
+        if i % 5 == 0:
+            words.insert(rng.randint(0, len(words)), rng.choice(HITS))
+        transcripts.append(' '.join(words) + f' {rng.choice(SAMPLE_LOCATIONS)}')
+    agencies = [f'{name} {n}' for n in range(60) for name in SAMPLE_AGENCIES]
+    return transcripts, agencies
+
+
+def legacy_is_fire(transcript):
+    if not transcript:
+        return False
+    transcript_lower = transcript.lower()
+    for pattern in app.FIRE_KEYWORDS:
+        if re.search(pattern, transcript_lower):
+            return True
+    if re.search(r'out[\s_-]?of[\s_-]?control[\s_-]?burn', transcript_lower):
+        return True
+    return False
+
+
+def legacy_is_ems_only(agency_name):
+    agency_lower = agency_name.lower()
+    fire_keywords = [
+        r'\bfire\b', r'\bfd\b', r'\bvfd\b',
+        r'fire[-_\s]?dept', r'fire[-_\s]?department',
+        r'fire[-_\s]?rescue', r'fire[-_\s]?ems',
+        r'fire[-_\s]?district'
+    ]
+    if any(re.search(pattern, agency_lower) for pattern in fire_keywords):
+        return False
+    obvious_ems_patterns = [
+        r'(^|[-_\s])ems([-_\s]|$)', r'(^|[-_\s])ambulance([-_\s]|$)',
+        r'(^|[-_\s])medic([-_\s]|$)', r'(^|[-_\s])paramedic',
+        r'(^|[-_\s])emt([-_\s]|$)', r'medical[-_\s]service',
+        r'emergency[-_\s]medical[-_\s]service'
+    ]
+    return any(re.search(pattern, agency_lower) for pattern in obvious_ems_patterns)
+
+
+def timed(func, items, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        results = [func(item) for item in items]
+    elapsed = time.perf_counter() - started
+    return results, elapsed / (repeat * len(items)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--transcripts', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    transcripts, agencies = make_corpus(args.transcripts)
+    old_fire, old_us = timed(legacy_is_fire, transcripts, args.repeat)
+    new_fire, new_us = timed(app.is_fire_call_in_transcript, transcripts, args.repeat)
+    assert old_fire == new_fire, 'keyword matcher disagrees with the per-pattern loop'
+    print(f"transcripts ({len(transcripts)}, {sum(old_fire)} hits)")
+    print(f"  per-pattern loop   {old_us:8.2f} us/transcript")
+    print(f"  compiled matcher   {new_us:8.2f} us/transcript   ({old_us / new_us:.1f}x)")
+
+    # Every scan re-classifies the agencies on the page, so repeats dominate in practice
+    app.classify_agency.cache_clear()
+    old_ems, old_us = timed(legacy_is_ems_only, agencies, args.repeat)
+    new_ems, new_us = timed(app.is_ems_only_agency, agencies, args.repeat)
+    assert old_ems == new_ems, 'agency classifier disagrees with the per-pattern loop'
+    print(f"agencies ({len(agencies)} names, {sum(old_ems)} EMS-only)")
+    print(f"  per-pattern loop   {old_us:8.2f} us/agency")
+    print(f"  memoized classify  {new_us:8.2f} us/agency   ({old_us / new_us:.1f}x)")
+    print(f"  cache {app.classify_agency.cache_info()}")
+
+
+if __name__ == '__main__':
+    main()
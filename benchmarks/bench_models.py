@@ -0,0 +1,107 @@
+"""Compare Whisper model sizes on a labelled audio set: latency vs. fire keyword recall.
+
+Usage: python benchmarks/bench_models.py AUDIO_DIR [--models tiny,base,small] [--max-seconds 25]
+
+AUDIO_DIR holds recorded calls. Labels come from AUDIO_DIR/labels.json
+({"file.mp3": true, ...}, true meaning a fire call) or, failing that, from a
+"fire_" / "nofire_" filename prefix. Models load through the same
+WhisperModelManager as the app, so WHISPER_COMPUTE_TYPE, WHISPER_CPU_THREADS,
+WHISPER_DOWNLOAD_ROOT and WHISPER_LOCAL_FILES_ONLY apply here too.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('DISABLE_BACKGROUND_JOBS', '1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+AUDIO_EXTENSIONS = ('.mp3', '.wav', '.m4a', '.ogg', '.flac')
+
+
+def load_labelled_clips(audio_dir):
+    labels = {}
+    labels_path = os.path.join(audio_dir, 'labels.json')
+    if os.path.exists(labels_path):
+        with open(labels_path) as f:
+            labels = json.load(f)
+    clips = []
+    for name in sorted(os.listdir(audio_dir)):
+        if not name.lower().endswith(AUDIO_EXTENSIONS):
+            continue
+        if name in labels:
+            is_fire = bool(labels[name])
+        elif name.startswith(('fire_', 'nofire_')):
+            is_fire = name.startswith('fire_')
+        else:
+            print(f"skipping {name}: no label")
+            continue
+        with open(os.path.join(audio_dir, name), 'rb') as f:
+            clips.append((name, f.read(), is_fire))
+    return clips
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def bench_model(model_name, clips, max_seconds):
+    manager = app.WhisperModelManager(model_name, app.WHISPER_DEVICE, app.WHISPER_COMPUTE_TYPE, app.WHISPER_CPU_THREADS,
+                                      1, app.WHISPER_DOWNLOAD_ROOT, app.WHISPER_LOCAL_FILES_ONLY)
+    model = manager.get()
+    latencies = []
+    true_positives = false_positives = fire_clips = 0
+    for name, data, is_fire in clips:
+        audio = app.decode_audio_bytes(data, max_seconds=max_seconds)
+        started = time.perf_counter()
+        transcript = app.run_whisper(model, audio)
+        latencies.append(time.perf_counter() - started)
+        detected = app.is_fire_call_in_transcript(transcript)
+        fire_clips += is_fire
+        true_positives += detected and is_fire
+        false_positives += detected and not is_fire
+    negatives = len(clips) - fire_clips
+    return {
+        'model': model_name,
+        'load_seconds': manager.load_seconds,
+        'warmup_seconds': manager.warmup_seconds,
+        'mean_seconds': statistics.mean(latencies),
+        'p95_seconds': percentile(latencies, 0.95),
+        'recall': true_positives / fire_clips if fire_clips else None,
+        'false_positive_rate': false_positives / negatives if negatives else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('audio_dir')
+    parser.add_argument('--models', default='tiny,base,small')
+    parser.add_argument('--max-seconds', type=int, default=25)
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    clips = load_labelled_clips(args.audio_dir)
+    if not clips:
+        sys.exit(f"no labelled audio in {args.audio_dir}")
+    print(f"{len(clips)} clips ({sum(c[2] for c in clips)} fire), streaming={app.STREAMING_DETECTION}, "
+          f"vad={app.WHISPER_VAD_FILTER}, compute={app.WHISPER_COMPUTE_TYPE}")
+    results = []
+    print(f"{'model':<10}{'load s':>8}{'warm s':>8}{'mean s':>8}{'p95 s':>8}{'recall':>8}{'fp rate':>9}")
+    for model_name in args.models.split(','):
+        r = bench_model(model_name.strip(), clips, args.max_seconds)
+        results.append(r)
+        fmt = lambda v: '   n/a' if v is None else f"{v:.2f}"  # noqa: E731
+        print(f"{r['model']:<10}{r['load_seconds']:>8.1f}{r['warmup_seconds']:>8.2f}{r['mean_seconds']:>8.2f}"
+              f"{r['p95_seconds']:>8.2f}{fmt(r['recall']):>8}{fmt(r['false_positive_rate']):>9}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark the call log scan against a saved HTML fixture served by a local stub server.
+
+Usage: python benchmarks/bench_scrape.py [--fixture PATH] [--iterations N] [--rows N]
+
+Compares the old full BeautifulSoup parse with the incremental lxml pull parser,
+then runs scrape_dispatch_calls end to end: a cold scan, a conditional (304)
+rescan, and a rescan after a handful of new rows appear.
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('DISABLE_BACKGROUND_JOBS', '1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests  # noqa: E402
+from bs4 import BeautifulSoup  # noqa: E402
+
+import app  # noqa: E402
+from benchmarks.fixtures import FIXTURE_DIR, StubServer  # noqa: E402
+
+
+def legacy_parse(content, limit):
+    soup = BeautifulSoup(content, 'html.parser')
+    rows = []
+    for row in soup.find('table').find_all('tr')[:limit]:
+        cols = row.find_all('td')
+        if len(cols) >= 4:
+            audio_tag = cols[0].find('audio')
+            if audio_tag and audio_tag.get('src'):
+                rows.append((audio_tag.get('src'), cols[1].text.strip(), cols[2].text.strip(), cols[3].text.strip()))
+    return rows
+
+
+def incremental_parse(content, limit, high_water_url=None):
+    rows = []
+    chunks = (content[i:i + 16384] for i in range(0, len(content), 16384))
+    for row in app.iter_call_log_rows(chunks):
+        if row['audio_url'] == high_water_url or len(rows) >= limit:
+            break
+        rows.append(row)
+    return rows
+
+
+def measure(func, iterations):
+    timings = []
+    peaks = []
+    for _ in range(iterations):
+        tracemalloc.start()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return statistics.median(timings) * 1000, max(peaks) / 1024
+
+
+def report(name, result):
+    print(f"{name:<34} median {result[0]:8.2f} ms   peak alloc {result[1]:8.0f} KiB")
+
+
+def reset_app_state():
+    app.call_queue.clear()
+    app.processed_audio_urls.clear()
+    app.call_log_state.update({'etag': None, 'last_modified': None, 'high_water_url': None})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fixture', default=os.path.join(FIXTURE_DIR, 'call_log.html'))
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--rows', type=int, default=20, help='rows examined per scan (the initial scan limit)')
+    args = parser.parse_args()
+
+    with open(args.fixture, 'rb') as f:
+        content = f.read()
+    logging.disable(logging.INFO)
+    print(f"fixture {args.fixture}: {len(content) / 1024:.0f} KiB, scanning {args.rows} rows")
+
+    report('parse: bs4 html.parser (old)', measure(lambda: legacy_parse(content, args.rows), args.iterations))
+    report('parse: lxml pull parser', measure(lambda: incremental_parse(content, args.rows), args.iterations))
+    high_water = incremental_parse(content, 5)[-1]['audio_url']
+    report('parse: lxml, 4 rows above mark', measure(lambda: incremental_parse(content, args.rows, high_water), args.iterations))
+
+    with StubServer({'/calls/': content}) as stub:
+        app.CALL_LOG_URL = stub.base_url + '/calls/'
+        report('scan: fetch + bs4 (old)', measure(
+            lambda: legacy_parse(requests.get(app.CALL_LOG_URL, timeout=30).content, args.rows), args.iterations))
+
+        def cold_scan():
+            reset_app_state()
+            app.scrape_dispatch_calls(max_rows=args.rows)
+        report('scan: cold', measure(cold_scan, args.iterations))
+        report('scan: unchanged (304)', measure(lambda: app.scrape_dispatch_calls(max_rows=args.rows), args.iterations))
+
+        sixth_row_url = incremental_parse(content, 6)[-1]['audio_url']
+
+        def delta_scan():
+            reset_app_state()
+            app.call_log_state['high_water_url'] = sixth_row_url
+            app.scrape_dispatch_calls(max_rows=args.rows)
+        report('scan: 5 new rows', measure(delta_scan, args.iterations))
+        print(f"stub served {len(stub.requests)} requests")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+import hashlib
+import io
+import os
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import av
+import numpy as np
+
+
+def make_test_mp3(seconds=40, sample_rate=22050, frequency=440.0):
+    # Synthetic radio-like clip (tone plus static) so benchmarks run without recorded audio
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    rng = np.random.default_rng(0)
+    samples = 0.3 * np.sin(2 * np.pi * frequency * t) + 0.05 * rng.standard_normal(len(t))
+    samples = samples.astype(np.float32)
+    buf = io.BytesIO()
+    with av.open(buf, 'w', format='mp3') as container:
+        stream = container.add_stream('libmp3lame', rate=sample_rate)
+        stream.layout = 'mono'
+        for i in range(0, len(samples), 1152):
+            frame = av.AudioFrame.from_ndarray(samples[i:i + 1152].reshape(1, -1), format='flt', layout='mono')
+            frame.sample_rate = sample_rate
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+    return buf.getvalue()
+
+
+def load_audio_files(paths, default_seconds=40):
+    if not paths:
+        return [('synthetic-%ds.mp3' % default_seconds, make_test_mp3(default_seconds))]
+    clips = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            clips.append((path, f.read()))
+    return clips
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+SAMPLE_AGENCIES = [
+    'Hamilton Twp Fire Dept', 'Mercer County EMS', 'Brookside VFD', 'Harris County Fire Rescue',
+    'Lakeview Ambulance Corps', 'Cook County Fire District 4', 'Oak Ridge Fire Company', 'Northside Paramedic Unit',
+]
+SAMPLE_LOCATIONS = [
+    'Trenton, NJ', 'Albany, NY', 'Houston, TX', 'Joliet, IL', 'Reno, NV', 'Boise, ID', 'Tulsa, OK', 'Camden, NJ',
+]
+
+
+def make_call_log_html(rows=300, audio_base='https://audio.example.com/calls', start=None):
+    # Same shape as the edispatches call log: newest call first, audio player in the first column
+    start = start or datetime(2025, 10, 10, 12, 0, 0)
+    parts = ['<html><head><title>Call Log</title></head><body><table>',
+             '<tr><th>Audio</th><th>Agency</th><th>Location</th><th>Time</th></tr>']
+    for i in range(rows):
+        call_time = start - timedelta(seconds=45 * i)
+        parts.append(
+            f'<tr><td><audio controls preload="none" src="{audio_base}/{rows - i}.mp3"></audio></td>'
+            f'<td>{SAMPLE_AGENCIES[i % len(SAMPLE_AGENCIES)]}</td>'
+            f'<td>{SAMPLE_LOCATIONS[i % len(SAMPLE_LOCATIONS)]}</td>'
+            f'<td>{call_time.strftime("%Y-%m-%d %H:%M:%S")}</td></tr>'
+        )
+    parts.append('</table></body></html>')
+    return '\n'.join(parts).encode('utf-8')
+
+
+class StubServer:
+    # Local HTTP server for benchmarks: serves in-memory bodies by path, honours If-None-Match
+    # and open-ended byte ranges (bytes=N-), and answers HEAD
+    def __init__(self, routes=None):
+        self.routes = dict(routes or {})
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                self.respond(send_body=True)
+
+            def do_HEAD(self):
+                self.respond(send_body=False)
+
+            def respond(self, send_body):
+                path = self.path.split('?', 1)[0]
+                stub.requests.append((self.command, path))
+                body = stub.routes.get(path)
+                if body is None:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                range_header = self.headers.get('Range', '')
+                if range_header.startswith('bytes=') and range_header.endswith('-'):
+                    start = int(range_header[6:-1])
+                    self.send_response(206)
+                    self.send_header('Content-Range', 'bytes %d-%d/%d' % (start, len(body) - 1, len(body)))
+                    body = body[start:]
+                else:
+                    self.send_response(200)
+                self.send_header('ETag', etag)
+                self.send_header('Accept-Ranges', 'bytes')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return 'http://127.0.0.1:%d' % self.httpd.server_address[1]
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
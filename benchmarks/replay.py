@@ -0,0 +1,298 @@
+"""Replay recorded call-log snapshots through the scrape -> transcribe -> detect pipeline.
+
+Usage: python benchmarks/replay.py [REPLAY_DIR] [--speed 60] [--transport server|adapter]
+                                   [--baseline FILE] [--write-baseline FILE] [--tolerance 0.1]
+
+REPLAY_DIR layout:
+  snapshots/*.html   call-log pages in replay order (sorted by name), one per scan
+  audio/             recordings, matched to the rows' <audio src> by file name
+  transcripts.json   optional {"file.mp3": "transcript", ...}; when present Whisper is skipped
+                     and these stand in for its output (audio is still downloaded and decoded)
+
+Without REPLAY_DIR a synthetic feed is generated from the fixtures, with fake transcripts.
+
+Each snapshot is served for one scan interval (60s / --speed) while scrape_dispatch_calls
+and process_call_queue run against it, so a backlog carries over between scans as it
+would live. Detection latency runs from the scan where a call first appears to the
+moment its transcript is recorded as a fire call. With --baseline, any metric worse
+than the baseline by more than --tolerance fails the run with exit status 1.
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import resource
+import sys
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+os.environ.setdefault('DISABLE_BACKGROUND_JOBS', '1')
+os.environ.pop('SHARED_STATE_DB', None)  # replay always runs against the in-memory call store
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests  # noqa: E402
+from requests.structures import CaseInsensitiveDict  # noqa: E402
+
+import app  # noqa: E402
+from benchmarks.fixtures import StubServer, make_call_log_html, make_test_mp3  # noqa: E402
+
+# Metric name -> whether higher values are better
+BASELINE_METRICS = {
+    'calls_per_minute': True,
+    'detections': True,
+    'detection_latency_p50': False,
+    'detection_latency_p95': False,
+    'detection_latency_p99': False,
+    'peak_rss_mib': False,
+}
+SYNTHETIC_TRANSCRIPTS = [
+    'engine 4 respond to a brush fire along the highway',
+    'medic 2 respond for a lift assist at the senior center',
+    'report of smoke showing from a two story residential',
+    'units clear, return to quarters',
+]
+
+
+class ReplaySource:
+    # Snapshots (bytes, in replay order), audio by file name and optional fake transcripts
+    def __init__(self, snapshots, audio, transcripts=None):
+        self.snapshots = snapshots
+        self.audio = audio
+        self.transcripts = transcripts
+
+
+def load_replay_dir(replay_dir):
+    snapshot_dir = os.path.join(replay_dir, 'snapshots')
+    snapshots = []
+    for name in sorted(os.listdir(snapshot_dir)):
+        if name.endswith(('.html', '.htm')):
+            with open(os.path.join(snapshot_dir, name), 'rb') as f:
+                snapshots.append(f.read())
+    audio = {}
+    audio_dir = os.path.join(replay_dir, 'audio')
+    if os.path.isdir(audio_dir):
+        for name in os.listdir(audio_dir):
+            with open(os.path.join(audio_dir, name), 'rb') as f:
+                audio[name] = f.read()
+    transcripts = None
+    transcripts_path = os.path.join(replay_dir, 'transcripts.json')
+    if os.path.exists(transcripts_path):
+        with open(transcripts_path) as f:
+            transcripts = json.load(f)
+    return ReplaySource(snapshots, audio, transcripts)
+
+
+def synthetic_source(scans, rows_per_scan, clip_seconds=10):
+    # A feed that gains rows_per_scan calls per scan; make_call_log_html spaces rows 45s apart
+    start = datetime(2025, 10, 10, 12, 0, 0)
+    snapshots = [
+        make_call_log_html((scan + 1) * rows_per_scan, 'https://audio.example.com/calls',
+                           start + timedelta(seconds=45 * rows_per_scan * scan))
+        for scan in range(scans)
+    ]
+    clip = make_test_mp3(clip_seconds)
+    total = scans * rows_per_scan
+    audio = {f'{i}.mp3': clip for i in range(1, total + 1)}
+    transcripts = {f'{i}.mp3': SYNTHETIC_TRANSCRIPTS[i % len(SYNTHETIC_TRANSCRIPTS)] for i in range(1, total + 1)}
+    return ReplaySource(snapshots, audio, transcripts)
+
+
+def audio_name(audio_url):
+    return urlsplit(audio_url).path.rsplit('/', 1)[-1]
+
+
+def rewrite_audio_urls(snapshot, base_url):
+    # Point every <audio src> at the replay transport, keeping the file name
+    return re.sub(rb'src="([^"]*)"',
+                  lambda m: b'src="%s/audio/%s"' % (base_url.encode(), audio_name(m.group(1).decode()).encode()),
+                  snapshot)
+
+
+class RoutesAdapter(requests.adapters.BaseAdapter):
+    # In-process transport for app.http_session: serves the same routes as StubServer
+    # (including ETag / If-None-Match) without sockets
+    def __init__(self, routes):
+        super().__init__()
+        self.routes = routes
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        response.headers = CaseInsensitiveDict()
+        body = self.routes.get(urlsplit(request.url).path)
+        if body is None:
+            response.status_code = 404
+            response._content = b''
+            return response
+        etag = '"%x-%d"' % (hash(body) & 0xffffffff, len(body))
+        response.headers['ETag'] = etag
+        if request.headers.get('If-None-Match') == etag:
+            response.status_code = 304
+            response._content = b''
+        else:
+            response.status_code = 200
+            response._content = b'' if request.method == 'HEAD' else body
+        response.headers['Content-Length'] = str(len(body))
+        return response
+
+    def close(self):
+        pass
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))], 3)
+
+
+def reset_app_state():
+    app.call_queue.clear()
+    app.processed_audio_urls.clear()
+    app.call_log_state.update({'etag': None, 'last_modified': None, 'high_water_url': None})
+    for call in app.fire_calls.list():
+        app.fire_calls.delete(call['id'])
+
+
+def run_replay(source, base_url, routes, speed, rows, drain=True):
+    interval = 60.0 / speed
+    first_seen = {}
+    latencies = []
+    counts = {'transcribed': 0}
+    processing_seconds = 0.0
+    record_transcript = app.record_transcript
+
+    def timed_record_transcript(call_info, transcript):
+        record_transcript(call_info, transcript)
+        counts['transcribed'] += 1
+        if app.is_fire_call_in_transcript(transcript):
+            latencies.append(time.time() - first_seen.get(call_info['audio_url'], time.time()))
+
+    def process_until(deadline):
+        nonlocal processing_seconds
+        while deadline is None or time.time() < deadline:
+            started = time.time()
+            processed = app.process_call_queue(max_calls=1)
+            processing_seconds += time.time() - started
+            if not processed:
+                return
+
+    app.record_transcript = timed_record_transcript
+    app.CALL_LOG_URL = base_url + '/calls'
+    try:
+        for index, snapshot in enumerate(source.snapshots):
+            scan_started = time.time()
+            snapshot = rewrite_audio_urls(snapshot, base_url)
+            routes['/calls'] = snapshot
+            for row in app.iter_call_log_rows([snapshot]):
+                first_seen.setdefault(row['audio_url'], scan_started)
+            app.scrape_dispatch_calls(max_rows=rows, is_initial_scan=index == 0)
+            deadline = scan_started + interval
+            process_until(deadline)
+            time.sleep(max(0.0, deadline - time.time()))
+        if drain:
+            process_until(None)
+    finally:
+        app.record_transcript = record_transcript
+
+    calls = counts['transcribed']
+    return {
+        'scans': len(source.snapshots),
+        'calls': calls,
+        'detections': len(latencies),
+        'left_in_queue': len(app.call_queue),
+        'calls_per_minute': round(calls / processing_seconds * 60, 1) if processing_seconds else 0.0,
+        'detection_latency_p50': percentile(latencies, 50),
+        'detection_latency_p95': percentile(latencies, 95),
+        'detection_latency_p99': percentile(latencies, 99),
+        # ru_maxrss is KiB on Linux
+        'peak_rss_mib': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def compare_to_baseline(result, baseline, tolerance):
+    regressions = []
+    for metric, higher_is_better in BASELINE_METRICS.items():
+        current, expected = result.get(metric), baseline.get(metric)
+        if current is None or expected is None:
+            continue
+        if higher_is_better and current < expected * (1 - tolerance):
+            regressions.append(f"{metric}: {current} < baseline {expected}")
+        elif not higher_is_better and current > expected * (1 + tolerance):
+            regressions.append(f"{metric}: {current} > baseline {expected}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('replay_dir', nargs='?', help='directory with snapshots/, audio/ and optional transcripts.json')
+    parser.add_argument('--speed', type=float, default=60.0, help='time acceleration; a 60s scan interval lasts 60/speed seconds')
+    parser.add_argument('--rows', type=int, default=10, help='rows examined per scan (the scheduled scan uses 10)')
+    parser.add_argument('--transport', choices=['server', 'adapter'], default='server',
+                        help='serve through a local stub HTTP server or an in-process requests adapter')
+    parser.add_argument('--states', help='comma-separated states to select (default: the app default)')
+    parser.add_argument('--scans', type=int, default=20, help='synthetic feed only: number of snapshots')
+    parser.add_argument('--rows-per-scan', type=int, default=4, help='synthetic feed only: new calls per snapshot')
+    parser.add_argument('--no-drain', action='store_true', help='stop after the last scan interval instead of draining the queue')
+    parser.add_argument('--baseline', help='baseline JSON to compare against')
+    parser.add_argument('--write-baseline', help='write this run\'s results as a baseline JSON')
+    parser.add_argument('--tolerance', type=float, default=0.10, help='allowed relative regression (default 0.10)')
+    parser.add_argument('--verbose', action='store_true', help='keep the app\'s per-call logging')
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.INFO)
+    source = load_replay_dir(args.replay_dir) if args.replay_dir else synthetic_source(args.scans, args.rows_per_scan)
+    if not source.snapshots:
+        parser.error('no snapshots to replay')
+    if args.states:
+        with app.states_lock:
+            app.selected_states = set(s.strip() for s in args.states.split(','))
+
+    if source.transcripts is not None:
+        transcripts = source.transcripts
+
+        def fake_transcribe_audio_bytes(audio_url, data, max_seconds=25):
+            app.decode_audio_bytes(data, max_seconds=max_seconds)
+            return transcripts.get(audio_name(audio_url), '')
+
+        app.transcribe_audio_bytes = fake_transcribe_audio_bytes
+        app.TRANSCRIBE_BATCH_SIZE = 1
+    else:
+        print(f"Loading Whisper model {app.WHISPER_MODEL}...")
+        app.load_whisper_model()
+
+    routes = {f'/audio/{name}': data for name, data in source.audio.items()}
+    reset_app_state()
+    if args.transport == 'server':
+        with StubServer() as server:
+            server.routes = routes
+            result = run_replay(source, server.base_url, routes, args.speed, args.rows, drain=not args.no_drain)
+    else:
+        base_url = 'http://replay.invalid'
+        app.http_session.mount(base_url + '/', RoutesAdapter(routes))
+        result = run_replay(source, base_url, routes, args.speed, args.rows, drain=not args.no_drain)
+
+    for metric, value in result.items():
+        print(f"{metric:<24} {value if value is not None else '-'}")
+    if args.write_baseline:
+        with open(args.write_baseline, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"Wrote baseline to {args.write_baseline}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(result, baseline, args.tolerance)
+        if regressions:
+            print("REGRESSION vs baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"OK: within {args.tolerance:.0%} of baseline")
+
+
+if __name__ == '__main__':
+    main()
@@ -209,7 +209,7 @@ function updateCallList(calls) {
                 </div>
                 <div class="call-details">
                     <p class="location">Location: ${call.location}</p>
-                    <div class="transcript">Transcript: ${call.transcript || 'No transcript'}</div>
+                    ${transcriptHtml(call)}
                     <p class="timestamp">Timestamp: ${date}</p>
                     ${audioHtml}
                     <button class="dismiss-btn" onclick="dismissCall('${call.id}')">×</button>
@@ -239,7 +239,7 @@ function updateCallList(calls) {
                 </div>
                 <div class="call-details">
                     <p class="location">Location: ${call.location}</p>
-                    <div class="transcript">Transcript: ${call.transcript || 'No transcript'}</div>
+                    ${transcriptHtml(call)}
                     <p class="timestamp">Timestamp: ${date}</p>
                     <div class="audio-player"><audio controls src="${call.audio_url}"></audio></div>
                     <button class="dismiss-btn" onclick="dismissCall('${call.id}')">×</button>
@@ -262,6 +262,37 @@ function updateCallList(calls) {
     }
 }
 
+let fullTranscripts = new Map(); // Full transcripts fetched on demand, by call ID
+
+function transcriptHtml(call) {
+    // The call list only carries a preview of long transcripts
+    const full = fullTranscripts.get(call.id);
+    if (full && full.preview === call.transcript) {
+        return `<div class="transcript">Transcript: ${full.text}</div>`;
+    }
+    const moreButton = call.transcript_truncated
+        ? ` <button class="more-btn" onclick="showFullTranscript(event, '${call.id}')">Show full</button>`
+        : '';
+    return `<div class="transcript">Transcript: ${call.transcript || 'No transcript'}${moreButton}</div>`;
+}
+
+function showFullTranscript(event, callId) {
+    event.stopPropagation(); // Don't acknowledge through the card's click handler
+    fetch(`/api/fire-calls/${encodeURIComponent(callId)}`)
+        .then(response => {
+            if (!response.ok) throw new Error('Failed to load call');
+            return response.json();
+        })
+        .then(data => {
+            const call = callsById.get(callId);
+            if (!call) return;
+            fullTranscripts.set(callId, { preview: call.transcript, text: data.transcript || '' });
+            const transcript = document.querySelector(`.call-card[data-id="${CSS.escape(callId)}"] .transcript`);
+            if (transcript) transcript.outerHTML = transcriptHtml(call);
+        })
+        .catch(error => console.error('Error loading full transcript:', error));
+}
+
 function acknowledgeCall(callId) {
     fetch(`/api/fire-calls/${encodeURIComponent(callId)}/acknowledge`, {
         method: 'POST',
@@ -319,32 +350,88 @@ function updateHealthStatus(data) {
     if (finishEl) finishEl.textContent = `Check Finish: ${formatTimestamp(data.check_finish)}`;
 }
 
+let callsById = new Map(); // Local copy of the server's call list, kept in sync from deltas
+let callsRevision = null; // Last revision received from /api/fire-calls
+let callsEpoch = null; // Store epoch the revision belongs to; changes when the server's store restarts
+let pollBackoff = 1000;
+
+function applyFireCalls(data) {
+    // Returns whether the response moved the client forward
+    if (!data.full && data.epoch === callsEpoch && data.revision < callsRevision) return false; // Stale response
+    const progressed = data.epoch !== callsEpoch || data.revision !== callsRevision;
+    if (data.full || callsRevision === null) {
+        callsById = new Map((data.calls || []).map(call => [call.id, call]));
+    } else {
+        (data.calls || []).forEach(call => callsById.set(call.id, call));
+        (data.removed || []).forEach(id => callsById.delete(id));
+    }
+    callsRevision = data.revision;
+    callsEpoch = data.epoch;
+    fullTranscripts.forEach((_, id) => { if (!callsById.has(id)) fullTranscripts.delete(id); });
+    const calls = Array.from(callsById.values())
+        .sort((a, b) => (b.first_detected || '').localeCompare(a.first_detected || ''));
+    updateCallList(calls);
+    // Count unacknowledged calls (filtered by state)
+    const unackCalls = calls.filter(call => !call.acknowledged && selectedStates.has(call.state));
+    const currentUnackCount = unackCalls.length;
+    // Blink if new unacknowledged calls arrived (reliable for batches)
+    if (currentUnackCount > previousUnackCount) {
+        playAlertSound(); // Always play on increase
+        triggerAlertBorder();
+        blinkTabTitle();
+    }
+    previousUnackCount = currentUnackCount;
+    // Set title based on current unack count
+    setTabTitle(currentUnackCount);
+    return progressed;
+}
+
+function fireCallsUrl(waitSeconds) {
+    if (callsRevision === null) return '/api/fire-calls';
+    const wait = waitSeconds ? `&wait=${waitSeconds}` : '';
+    return `/api/fire-calls?since=${callsRevision}&epoch=${encodeURIComponent(callsEpoch)}${wait}`;
+}
+
 function fetchFireCalls() {
-    fetch('/api/fire-calls')
+    // One-off refresh (after acknowledge/dismiss/filter changes); only the delta is transferred
+    return fetch(fireCallsUrl(0))
         .then(response => {
             if (!response.ok) throw new Error('Network response was not ok');
             return response.json();
         })
         .then(data => {
             console.log('Fire calls received:', data);
-            const calls = data.calls || [];
-            updateCallList(calls);
-            // Count unacknowledged calls (filtered by state)
-            const unackCalls = calls.filter(call => !call.acknowledged && selectedStates.has(call.state));
-            const currentUnackCount = unackCalls.length;
-            // Blink if new unacknowledged calls arrived (reliable for batches)
-            if (currentUnackCount > previousUnackCount) {
-                playAlertSound(); // Always play on increase
-                triggerAlertBorder();
-                blinkTabTitle();
-            }
-            previousUnackCount = currentUnackCount;
-            // Set title based on current unack count
-            setTabTitle(currentUnackCount);
+            applyFireCalls(data);
         })
         .catch(error => console.error('Error fetching fire calls:', error));
 }
 
+function pollFireCalls() {
+    // Long-poll: the server holds the request until a call changes (or 25s pass)
+    const started = Date.now();
+    fetch(fireCallsUrl(25))
+        .then(response => {
+            if (!response.ok) throw new Error('Network response was not ok');
+            return response.json();
+        })
+        .then(data => {
+            const progressed = applyFireCalls(data);
+            if (!progressed && Date.now() - started < 1000) {
+                // Answered at once without anything new: don't spin, back off
+                setTimeout(pollFireCalls, pollBackoff);
+                pollBackoff = Math.min(pollBackoff * 2, 30000);
+                return;
+            }
+            pollBackoff = 1000;
+            pollFireCalls();
+        })
+        .catch(error => {
+            console.error('Error polling fire calls:', error);
+            setTimeout(pollFireCalls, pollBackoff);
+            pollBackoff = Math.min(pollBackoff * 2, 30000);
+        });
+}
+
 function fetchHealthStatus() {
     fetch('/api/health')
         .then(response => {
@@ -379,11 +466,10 @@ document.addEventListener('DOMContentLoaded', () => {
     if (collapseBtn) {
         collapseBtn.addEventListener('click', toggleStateFilter);
     }
-    fetchFireCalls();
+    fetchFireCalls().then(pollFireCalls);
     fetchHealthStatus();
-    setInterval(fetchFireCalls, 30000); // Slower polling: every 30 seconds to reduce interruptions
     setInterval(fetchHealthStatus, 20000); // Health check every 20 seconds
-    navigator.serviceWorker.register('/static/sw.js')
+    navigator.serviceWorker.register('/static/sw.js', { scope: '/' })
         .then(reg => console.log('Service Worker registered!', reg))
         .catch(err => console.error('Service Worker registration failed:', err));
 
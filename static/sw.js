@@ -1,11 +1,7 @@
-const CACHE_NAME = 'watch-duty-cache-v1';
-const urlsToCache = [
-    '/',
-    '/static/style.css',
-    '/static/app.js',
-    '/static/manifest.json',
-    '/static/icon-192.png'
-];
+const CACHE_NAME = 'watch-duty-cache-v3';
+// Assets are requested with content-hash URLs (?v=...) by the page, so they are cached as they
+// are first fetched; only the page itself is cached up front.
+const urlsToCache = ['/'];
 
 self.addEventListener('install', event => {
     event.waitUntil(
@@ -18,12 +14,43 @@ self.addEventListener('install', event => {
     );
 });
 
+function refreshCache(request) {
+    return fetch(request).then(response => {
+        if (response.ok) {
+            const copy = response.clone();
+            caches.open(CACHE_NAME).then(cache => {
+                cache.put(request, copy);
+                // Drop older hashed versions of the same asset
+                const url = new URL(request.url);
+                if (url.searchParams.has('v')) {
+                    cache.keys().then(keys => keys.forEach(key => {
+                        const cached = new URL(key.url);
+                        if (cached.pathname === url.pathname && cached.search !== url.search) cache.delete(key);
+                    }));
+                }
+            });
+        }
+        return response;
+    });
+}
+
 self.addEventListener('fetch', event => {
+    const url = new URL(event.request.url);
+    // API calls (including the long-poll), metrics, other origins (call audio) and non-GETs go straight to the network
+    if (event.request.method !== 'GET' || url.origin !== self.location.origin ||
+        url.pathname.startsWith('/api/') || url.pathname === '/metrics') return;
+    // Stale-while-revalidate: answer from the cache at once and refresh it in the background.
+    // Hashed assets never change, so a cached copy of one needs no refresh.
     event.respondWith(
-        caches.match(event.request)
-            .then(response => {
-                return response || fetch(event.request);
-            })
+        caches.match(event.request).then(cached => {
+            if (cached && url.searchParams.has('v')) return cached;
+            const network = refreshCache(event.request);
+            if (cached) {
+                event.waitUntil(network.catch(() => {}));
+                return cached;
+            }
+            return network;
+        })
     );
 });
 
@@ -0,0 +1,52 @@
+import os
+import sys
+
+os.environ.setdefault('DISABLE_BACKGROUND_JOBS', '1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+from app import stitch_transcripts  # noqa: E402
+
+
+def test_drops_words_repeated_at_the_join():
+    assert stitch_transcripts("engine 4 respond to a structure fire at 12 main",
+                              "fire at twelve Main Street smoke showing") == \
+        "engine 4 respond to a structure fire at twelve Main Street smoke showing"
+
+
+def test_overlap_ignores_punctuation_and_case():
+    assert stitch_transcripts("units respond to main street.", "Main Street. Caller reports smoke") == \
+        "units respond to main street. Caller reports smoke"
+
+
+def test_no_overlap_concatenates():
+    assert stitch_transcripts("units clear", "return to quarters") == "units clear return to quarters"
+
+
+def test_repeated_address_does_not_swallow_text():
+    stitched = stitch_transcripts(
+        "medic 3 respond to 12 elm street for a fall, 12 elm street",
+        "elm street. also dispatch engine 4, caller reports a grass fire behind 12 elm street")
+    assert stitched == ("medic 3 respond to 12 elm street for a fall, 12 elm street "
+                        "also dispatch engine 4, caller reports a grass fire behind 12 elm street")
+    assert app.find_fire_keyword(stitched)
+
+
+def test_phrase_repeated_away_from_the_join_is_not_an_overlap():
+    # "main street" recurs, but only the copy at the join is the audio overlap
+    stitched = stitch_transcripts(
+        "engine 2 to main street for smoke, cross street oak, main street",
+        "main street command requests a second alarm main street")
+    assert stitched == ("engine 2 to main street for smoke, cross street oak, main street "
+                        "command requests a second alarm main street")
+
+
+def test_match_must_start_near_the_beginning_of_the_addition():
+    previous = "ladder 1 respond to 40 pine avenue"
+    addition = " ".join(["caller"] * 12) + " 40 pine avenue"
+    assert stitch_transcripts(previous, addition) == previous + " " + addition
+
+
+def test_empty_sides():
+    assert stitch_transcripts("", "brush fire") == "brush fire"
+    assert stitch_transcripts("brush fire", "") == "brush fire"